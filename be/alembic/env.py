@@ -7,20 +7,21 @@ Descripción: Configuración del entorno de ejecución de Alembic para migracion
           ni qué modelos existen, y las migraciones auto-generadas estarían vacías.
 """
 
+import logging
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config, pool
 
 from alembic import context
 
-# ¿Qué? Importamos la Base de SQLAlchemy y todos los modelos.
+# ¿Qué? Importamos la Base de SQLAlchemy y el paquete de modelos.
 # ¿Para qué? Alembic necesita acceso a Base.metadata para comparar el estado actual
 #            de los modelos con el estado de la BD y detectar diferencias.
-# ¿Impacto? El import de app.models ejecuta models/__init__.py, que a su vez importa
-#           User y PasswordResetToken. Sin estos imports, autogenerate no detecta nada.
+# ¿Impacto? El import de app.models ejecuta models/__init__.py, que escanea e importa
+#           TODOS los módulos de app/models/. Sin esto, autogenerate no detecta nada.
+import app.models  # noqa: F401 — registra todos los modelos en Base.metadata
 from app.database import Base
-from app.models import User, PasswordResetToken, EmailVerificationToken  # noqa: F401 — necesarios para autogenerate
-from app.config import settings
+from app.config import get_settings
 
 # ¿Qué? Objeto de configuración de Alembic que lee alembic.ini.
 # ¿Para qué? Acceder a valores del archivo .ini (rutas, logging, etc.).
@@ -29,7 +30,7 @@ config = context.config
 # ¿Qué? Sobreescribimos la URL de la BD con el valor de nuestro archivo .env.
 # ¿Para qué? Evitar hardcodear credenciales en alembic.ini.
 # ¿Impacto? Alembic usará la misma DATABASE_URL que el backend, garantizando consistencia.
-config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+config.set_main_option("sqlalchemy.url", get_settings().DATABASE_URL)
 
 # ¿Qué? Configura el sistema de logging de Python según alembic.ini.
 # ¿Para qué? Ver mensajes informativos durante las migraciones (ej: "Running upgrade ...").
@@ -42,6 +43,27 @@ if config.config_file_name is not None:
 # ¿Impacto? Si target_metadata es None, autogenerate no detecta ningún cambio.
 target_metadata = Base.metadata
 
+# ¿Qué? Lista en el log las tablas que Alembic conoce antes de comparar.
+# ¿Para qué? Permitir revisar de un vistazo, antes de `alembic revision --autogenerate`,
+#            que todas las tablas esperadas están registradas.
+# ¿Impacto? Si falta una tabla aquí, la migración autogenerada intentaría eliminarla.
+logging.getLogger("alembic.env").info(
+    "Tablas registradas en Base.metadata: %s", ", ".join(sorted(target_metadata.tables))
+)
+
+# ¿Qué? Opciones de comparación que usa autogenerate (`revision --autogenerate`, `check`).
+# ¿Para qué? compare_type detecta cambios de tipo (ej: String(255) → String(64)) y
+#            compare_server_default detecta cambios en los DEFAULT de la BD (ej: now()).
+#            Sin ellos, esos cambios no generan migración y el esquema real diverge de
+#            los modelos sin que nadie lo note.
+# ¿Impacto? compare_type ya es el default de Alembic ≥ 1.12; se declara explícito para que
+#           no dependa de la versión. compare_server_default agrega la comparación de los
+#           DEFAULT sobre la misma reflexión de columnas que ya hace autogenerate.
+_COMPARE_OPTIONS = {
+    "compare_type": True,
+    "compare_server_default": True,
+}
+
 
 def run_migrations_offline() -> None:
     """Ejecuta migraciones en modo 'offline' (sin conexión a la BD).
@@ -56,6 +78,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        **_COMPARE_OPTIONS,
     )
 
     with context.begin_transaction():
@@ -70,6 +93,11 @@ def run_migrations_online() -> None:
     ¿Impacto? Cada migración altera la estructura de la BD. Siempre hacer backup
               antes de ejecutar migraciones en producción.
     """
+    # ¿Qué? NullPool: cada conexión se abre y se cierra, sin pool.
+    # ¿Para qué? Una migración es un proceso corto que usa una sola conexión; un pool solo
+    #            dejaría conexiones ociosas abiertas. Además es el modo correcto detrás de
+    #            PgBouncer en "transaction pooling" (igual que DB_USE_NULLPOOL en la app).
+    # ¿Impacto? Al terminar la migración no queda ninguna conexión colgada en el servidor.
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -80,6 +108,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            **_COMPARE_OPTIONS,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,54 @@
+"""add email format check: CHECK ck_users_email_format on users.email
+
+¿Qué? Migración que agrega una restricción CHECK con la forma mínima de un email
+      (algo@dominio.tld) sobre `users.email`.
+¿Para qué? Hacer de la BD la fuente de verdad del formato, ya que login y forgot-password
+           dejan de usar EmailStr y validan solo con la misma expresión regular.
+¿Impacto? Se crea NOT VALID y luego se valida: el ALTER inicial no recorre la tabla
+          bloqueando escrituras, y VALIDATE CONSTRAINT solo toma un lock compatible con
+          INSERT/UPDATE. Todos los emails existentes pasaron EmailStr, así que cumplen.
+
+Revision ID: a7b9c1d3e5f7
+Revises: f6a8b0c2d4e6
+Create Date: 2026-10-15 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+# ¿Qué? Identificadores de esta migración para que Alembic lleve el historial.
+# ¿Para qué? Alembic encadena migraciones usando estos IDs — down_revision apunta
+#            a la migración anterior (hash_password_reset_tokens).
+# ¿Impacto? Si se alteran estos valores, Alembic no podrá reconstruir el historial.
+revision: str = "a7b9c1d3e5f7"
+down_revision: Union[str, Sequence[str], None] = "f6a8b0c2d4e6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Agrega la restricción ck_users_email_format a la tabla users.
+
+    ¿Qué? ADD CONSTRAINT ... NOT VALID seguido de VALIDATE CONSTRAINT.
+    ¿Para qué? Aplicar la regla a las filas nuevas de inmediato y verificar las
+              existentes sin bloquear la tabla durante el recorrido.
+    ¿Impacto? Si algún email existente no cumple, VALIDATE falla y la migración se
+              revierte completa (Alembic la ejecuta en una transacción).
+    """
+    op.execute(
+        "ALTER TABLE users ADD CONSTRAINT ck_users_email_format "
+        r"CHECK (email ~ '^[^@\s]+@[^@\s]+\.[^@\s]+$') NOT VALID"
+    )
+    op.execute("ALTER TABLE users VALIDATE CONSTRAINT ck_users_email_format")
+
+
+def downgrade() -> None:
+    """Revierte la migración: elimina la restricción ck_users_email_format.
+
+    ¿Qué? DROP CONSTRAINT sobre la tabla users.
+    ¿Para qué? Permitir rollback al esquema previo.
+    ¿Impacto? Ningún dato se pierde; solo se deja de verificar el formato en la BD.
+    """
+    op.drop_constraint("ck_users_email_format", "users", type_="check")
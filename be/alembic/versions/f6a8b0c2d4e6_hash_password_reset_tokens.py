@@ -0,0 +1,99 @@
+"""hash password reset tokens: token -> token_hash (SHA-256)
+
+¿Qué? Migración que reemplaza la columna `token` de `password_reset_tokens` por
+      `token_hash`, que guarda el SHA-256 (hex, 64 caracteres) del token.
+¿Para qué? Que el token en claro solo exista en el email enviado al usuario. Si la BD se
+           filtra, los hashes no permiten restablecer contraseñas ajenas (OWASP A02).
+¿Impacto? Los tokens pendientes NO se invalidan: sus valores se hashean en la misma
+          migración, así que los enlaces ya enviados siguen funcionando. El índice UNIQUE
+          pasa de claves de hasta 255 caracteres a claves fijas de 64.
+
+Revision ID: f6a8b0c2d4e6
+Revises: e5f7a9b1c3d5
+Create Date: 2026-10-15 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# ¿Qué? Identificadores de esta migración para que Alembic lleve el historial.
+# ¿Para qué? Alembic encadena migraciones usando estos IDs — down_revision apunta
+#            a la migración anterior (add_locale_to_users).
+# ¿Impacto? Si se alteran estos valores, Alembic no podrá reconstruir el historial.
+revision: str = "f6a8b0c2d4e6"
+down_revision: Union[str, Sequence[str], None] = "e5f7a9b1c3d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Hashea los tokens existentes y renombra la columna a token_hash VARCHAR(64).
+
+    ¿Qué? Backfill con sha256() de PostgreSQL, luego renombrar, reducir el tipo y
+          recrear el índice único con el nuevo nombre.
+    ¿Para qué? Migrar sin perder los tokens pendientes de uso.
+    ¿Impacto? sha256() existe en PostgreSQL 11+; el proyecto usa PostgreSQL 17.
+    """
+    # ¿Qué? Reemplazar cada token en claro por su hash SHA-256 en hexadecimal.
+    # ¿Para qué? El backend ahora busca por hashlib.sha256(token).hexdigest(); este UPDATE
+    #            produce exactamente el mismo valor (UTF-8 → SHA-256 → hex en minúsculas).
+    # ¿Impacto? Después de esta sentencia ya no queda ningún token en claro en la tabla.
+    op.execute(
+        "UPDATE password_reset_tokens "
+        "SET token = encode(sha256(convert_to(token, 'UTF8')), 'hex')"
+    )
+
+    op.drop_index(
+        op.f("ix_password_reset_tokens_token"), table_name="password_reset_tokens"
+    )
+    op.alter_column(
+        "password_reset_tokens",
+        "token",
+        new_column_name="token_hash",
+        type_=sa.String(length=64),
+        existing_type=sa.String(length=255),
+        existing_nullable=False,
+    )
+    op.create_index(
+        op.f("ix_password_reset_tokens_token_hash"),
+        "password_reset_tokens",
+        ["token_hash"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Revierte la migración: vuelve a la columna token VARCHAR(255).
+
+    ¿Qué? Recrea la columna con el nombre y tipo anteriores.
+    ¿Para qué? Permitir rollback al esquema previo.
+    ¿Impacto? Un hash no se puede revertir al token original, así que los tokens
+              pendientes se eliminan: los usuarios afectados deben solicitar un nuevo
+              enlace de recuperación. Solo usar en desarrollo.
+    """
+    # ¿Qué? Eliminar los tokens hasheados. SHA-256 es de un solo sentido: este downgrade
+    #       NO puede restaurar los tokens en claro que existían antes del upgrade.
+    # ¿Para qué? Evitar que el código anterior compare tokens en claro contra hashes.
+    # ¿Impacto? Los enlaces de recuperación pendientes dejan de funcionar.
+    op.execute("DELETE FROM password_reset_tokens")
+
+    op.drop_index(
+        op.f("ix_password_reset_tokens_token_hash"), table_name="password_reset_tokens"
+    )
+    op.alter_column(
+        "password_reset_tokens",
+        "token_hash",
+        new_column_name="token",
+        type_=sa.String(length=255),
+        existing_type=sa.String(length=64),
+        existing_nullable=False,
+    )
+    op.create_index(
+        op.f("ix_password_reset_tokens_token"),
+        "password_reset_tokens",
+        ["token"],
+        unique=True,
+    )
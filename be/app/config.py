@@ -8,10 +8,21 @@ Descripción: Configuración centralizada del backend usando Pydantic Settings.
           lo que podría causar errores silenciosos o difíciles de depurar en tiempo de ejecución.
 """
 
-from pydantic import field_validator
+import os
+from functools import lru_cache
+
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+# ¿Qué? Archivo .env a leer, o None para usar solo las variables del entorno del proceso.
+# ¿Para qué? En contenedores las variables ya las inyecta el orquestador (docker-compose
+#            env_file, Kubernetes, etc.); con DISABLE_DOTENV=1 pydantic-settings no busca
+#            ni parsea el archivo en cada arranque de worker.
+# ¿Impacto? En desarrollo local no cambia nada: sin DISABLE_DOTENV se sigue leyendo .env.
+_ENV_FILE: str | None = None if os.getenv("DISABLE_DOTENV") == "1" else ".env"
+
+
 class Settings(BaseSettings):
     """Configuración de la aplicación cargada desde variables de entorno.
 
@@ -29,6 +40,59 @@ class Settings(BaseSettings):
     # ¿Impacto? Si es incorrecta, ninguna operación de lectura/escritura a la BD funcionará.
     DATABASE_URL: str
 
+    # ¿Qué? Número de conexiones que el pool mantiene abiertas de forma permanente.
+    # ¿Para qué? Cada request toma una sesión (get_db) — con el default de SQLAlchemy (5)
+    #            las peticiones concurrentes esperan en cola a que se libere una conexión.
+    # ¿Impacto? Reutilizar conexiones amortiza el handshake TCP + autenticación de PostgreSQL.
+    #           Ajustar según `--workers` de Uvicorn: cada worker tiene su propio pool, y el
+    #           total (workers × (pool_size + max_overflow)) no debe superar `max_connections`.
+    DB_POOL_SIZE: int = 20
+
+    # ¿Qué? Conexiones adicionales que el pool puede abrir temporalmente en picos de carga.
+    # ¿Para qué? Absorber ráfagas de tráfico sin mantener esas conexiones abiertas siempre.
+    # ¿Impacto? Las conexiones de overflow se cierran al devolverse si el pool ya está lleno.
+    DB_MAX_OVERFLOW: int = 20
+
+    # ¿Qué? Segundos tras los cuales una conexión se descarta y se abre una nueva.
+    # ¿Para qué? Evitar usar conexiones que un firewall, balanceador o PostgreSQL cerraron
+    #            por inactividad (ej: idle timeouts de 30-60 min en la nube).
+    # ¿Impacto? 300 s (5 min) queda por debajo de los idle timeouts habituales (NAT, RDS,
+    #           balanceadores), así que el pool casi nunca entrega un socket ya cortado;
+    #           -1 desactiva el reciclaje.
+    DB_POOL_RECYCLE: int = 300
+
+    # ¿Qué? Segundos máximos que un request espera a que el pool le entregue una conexión.
+    # ¿Para qué? Fallar rápido bajo saturación en lugar de acumular requests colgados.
+    # ¿Impacto? Si se agota, SQLAlchemy lanza TimeoutError y el request responde 500.
+    DB_POOL_TIMEOUT: int = 10
+
+    # ¿Qué? Ejecutar un ping (SELECT 1) a la BD cada vez que se toma una conexión del pool.
+    # ¿Para qué? Detectar conexiones muertas antes de usarlas en un request.
+    # ¿Impacto? Cuesta un viaje de red extra por request (~0.3 ms en LAN, ~2 ms entre zonas
+    #           de la nube). Activado por defecto (como antes de existir esta opción): sin él,
+    #           tras un reinicio de PostgreSQL cada conexión muerta del pool cuesta un 500.
+    #           Un despliegue con red estable puede desactivarlo (DB_POOL_PRE_PING=false) y
+    #           apoyarse en los keepalives TCP (DB_TCP_KEEPALIVES_*) y DB_POOL_RECYCLE.
+    DB_POOL_PRE_PING: bool = True
+
+    # ¿Qué? Keepalives TCP de libpq: segundos de inactividad antes del primer sondeo, segundos
+    #       entre sondeos y sondeos fallidos antes de dar el socket por muerto.
+    # ¿Para qué? Que el sistema operativo detecte una conexión caída (30 + 10 × 3 = 60 s) y la
+    #            cierre, en lugar de descubrirlo en el siguiente request.
+    # ¿Impacto? Los sondeos son paquetes vacíos a nivel de TCP: no ejecutan SQL ni añaden
+    #           latencia a los requests. No aplican a conexiones por socket Unix.
+    DB_TCP_KEEPALIVES_IDLE: int = 30
+    DB_TCP_KEEPALIVES_INTERVAL: int = 10
+    DB_TCP_KEEPALIVES_COUNT: int = 3
+
+    # ¿Qué? Desactiva el pool de conexiones de SQLAlchemy (usa NullPool).
+    # ¿Para qué? Cuando la BD está detrás de PgBouncer en modo "transaction pooling", el
+    #            pooling ya lo hace PgBouncer; un segundo pool en la app retiene conexiones
+    #            del servidor y sus pings pueden fallar al rotar PgBouncer las conexiones.
+    # ¿Impacto? Con True, cada sesión abre y cierra su conexión (barato contra PgBouncer,
+    #           costoso contra PostgreSQL directo) y se ignoran los valores DB_POOL_*.
+    DB_USE_NULLPOOL: bool = False
+
     # ────────────────────────────
     # 🔐 JWT y Seguridad
     # ────────────────────────────
@@ -83,6 +147,69 @@ class Settings(BaseSettings):
     # ¿Impacto? Define cuánto tiempo puede el usuario permanecer "logueado" sin volver a hacer login.
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # ¿Qué? Segundos que get_current_user recuerda un access token ya validado.
+    # ¿Para qué? Un SPA hace 5-20 peticiones por página con el MISMO token; cachear el
+    #            resultado evita repetir la verificación HMAC y la búsqueda por email.
+    # ¿Impacto? Lo único cacheado es "este token pertenece al usuario X"; el estado de la
+    #           cuenta lo gobierna USER_CACHE_TTL_SECONDS. 0 desactiva la caché.
+    TOKEN_CACHE_TTL_SECONDS: int = 30
+
+    # ¿Qué? Número máximo de tokens distintos que se mantienen en la caché (por worker).
+    # ¿Para qué? Acotar la memoria usada aunque lleguen muchos tokens diferentes.
+    # ¿Impacto? Al llenarse, se descarta el token usado hace más tiempo (LRU).
+    TOKEN_CACHE_MAXSIZE: int = 10_000
+
+    # ¿Qué? Segundos que get_current_user reutiliza los datos del usuario autenticado
+    #       sin consultar la BD.
+    # ¿Para qué? Tras un acierto en la caché de tokens, el único costo restante por request
+    #            era el SELECT por clave primaria del usuario.
+    # ¿Impacto? Los cambios hechos por este mismo worker (locale, contraseña, desactivación)
+    #           invalidan la entrada al instante; los hechos por OTRO worker o directamente
+    #           en la BD pueden tardar hasta este TTL en verse (ej: una cuenta desactivada
+    #           sigue entrando hasta 15 s). El hash de la contraseña no se cachea:
+    #           change_password siempre relee la fila. 0 desactiva la caché.
+    USER_CACHE_TTL_SECONDS: int = 15
+
+    # ¿Qué? Número máximo de usuarios distintos en la caché (por worker).
+    # ¿Para qué? Acotar la memoria usada; al llenarse se descarta el menos usado (LRU).
+    # ¿Impacto? Cada entrada guarda solo las columnas del usuario (unos cientos de bytes).
+    USER_CACHE_MAXSIZE: int = 5_000
+
+    # ¿Qué? Máximo de hashes/verificaciones de contraseña simultáneos por worker.
+    # ¿Para qué? Cada hash ocupa un núcleo de CPU decenas de ms: con más hashes en paralelo que
+    #            núcleos no se gana throughput, solo se ocupan más hilos del threadpool que
+    #            comparten los demás endpoints (GET /me, refresh, etc.).
+    # ¿Impacto? Por defecto, el número de CPUs de la máquina. Los requests que exceden el
+    #           límite esperan su turno (ver PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS).
+    PASSWORD_HASH_MAX_CONCURRENCY: int = Field(
+        default_factory=lambda: os.cpu_count() or 1
+    )
+
+    # ¿Qué? Parámetros de costo de argon2id: memoria (KiB), iteraciones y paralelismo.
+    # ¿Para qué? Ajustar el costo del hash al hardware del despliegue — la meta es que un
+    #            hash tarde lo más posible sin degradar el login (OWASP: < 1 s).
+    # ¿Impacto? Los defaults son el mínimo de OWASP (m=19 MiB, t=2, p=1). Con más
+    #           memoria/CPU disponible, RFC 9106 sugiere m=65536, t=3, p=4. Al cambiarlos,
+    #           los hashes existentes se siguen verificando (los parámetros van dentro del
+    #           hash) y se re-hashean con los nuevos valores en el siguiente login exitoso.
+    #           Cada hash simultáneo reserva PASSWORD_HASH_MEMORY_COST KiB de RAM.
+    PASSWORD_HASH_MEMORY_COST: int = 19_456
+    PASSWORD_HASH_TIME_COST: int = 2
+    PASSWORD_HASH_PARALLELISM: int = 1
+
+    # ¿Qué? Segundos máximos que un request espera turno para hashear una contraseña.
+    # ¿Para qué? Bajo una ráfaga de logins (o un ataque), responder rápido 503 +
+    #            Retry-After en lugar de acumular hilos bloqueados indefinidamente.
+    # ¿Impacto? El cliente recibe "503 Service Unavailable" y puede reintentar en 1 s.
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 5.0
+
+    # ¿Qué? Cada cuántos segundos se borran los tokens de reset expirados o ya usados.
+    # ¿Para qué? Que password_reset_tokens (y su índice) no crezcan con cada solicitud de
+    #            "olvidé mi contraseña"; la limpieza corre en segundo plano en cada worker.
+    # ¿Impacto? 0 desactiva la tarea (ej: si la limpieza se delega a un cron externo que
+    #           llama a purge_expired_reset_tokens).
+    RESET_TOKEN_PURGE_INTERVAL_SECONDS: int = 3600
+
     # ────────────────────────────
     # 📧 Email — Resend
     # ────────────────────────────
@@ -126,6 +253,12 @@ class Settings(BaseSettings):
     SMTP_USERNAME: str = ""
     SMTP_PASSWORD: str = ""
 
+    # ¿Qué? Segundos máximos de espera en cada operación de red con el servidor SMTP.
+    # ¿Para qué? smtplib espera indefinidamente por defecto: un servidor caído o lento
+    #            dejaría colgado el hilo que envía el email.
+    # ¿Impacto? Al vencer, el envío falla y el enlace se loggea como fallback.
+    SMTP_TIMEOUT_SECONDS: float = 10.0
+
     # ────────────────────────────
     # 🌐 URLs
     # ────────────────────────────
@@ -151,14 +284,39 @@ class Settings(BaseSettings):
     # ¿Para qué? Indicar que las variables se cargan desde el archivo .env en la carpeta be/.
     # ¿Impacto? Sin esto, Pydantic no lee el archivo .env y solo busca variables del sistema.
     model_config = SettingsConfigDict(
-        env_file=".env",
+        env_file=_ENV_FILE,
         env_file_encoding="utf-8",
         case_sensitive=True,
     )
 
 
+# ¿Qué? Fábrica cacheada de la configuración.
+# ¿Para qué? Construir Settings() recorre os.environ, lee el .env y valida todos los campos;
+#            con lru_cache ese trabajo se hace UNA sola vez por proceso, sin importar
+#            cuántos módulos o dependencias pidan la configuración.
+# ¿Impacto? `get_settings.cache_clear()` solo afecta a las llamadas NUEVAS a
+#           get_settings(): los módulos de la app ya enlazaron `settings` al importarse y
+#           siguen viendo el objeto original (para cambiar un valor en un test, usar
+#           monkeypatch.setattr(settings, ...)).
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Retorna la instancia única (cacheada) de la configuración.
+
+    ¿Qué? Instancia Settings la primera vez y retorna el mismo objeto en llamadas siguientes.
+    ¿Para qué? Usarse como dependencia de FastAPI (Depends(get_settings)) o desde código
+              que necesite la configuración sin depender de un import con efectos secundarios.
+    ¿Impacto? Si falta alguna variable requerida, la excepción de validación se lanza
+              en la primera llamada.
+
+    Returns:
+        La configuración validada de la aplicación.
+    """
+    return Settings()
+
+
 # ¿Qué? Instancia singleton de la configuración.
 # ¿Para qué? Importar `settings` desde cualquier módulo sin re-instanciar la clase.
-# ¿Impacto? Se crea UNA sola vez al importar — todas las variables se validan en ese momento.
+# ¿Impacto? Es el mismo objeto que retorna get_settings() — se mantiene por compatibilidad
+#           con todos los módulos que hacen `from app.config import settings`.
 #           Si falta alguna variable requerida, la app falla aquí con un error claro.
-settings = Settings()
+settings = get_settings()
@@ -9,18 +9,64 @@ Descripción: Configuración de la conexión a PostgreSQL con SQLAlchemy 2.0.
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.config import settings
 
+# ¿Qué? Parámetros del pool de conexiones según el modo de despliegue.
+# ¿Para qué? Detrás de PgBouncer (DB_USE_NULLPOOL=True) la app no debe mantener su propio
+#            pool; en cualquier otro caso se usa QueuePool dimensionado desde la config.
+# ¿Impacto? NullPool no acepta pool_size, max_overflow, pool_timeout ni pool_use_lifo —
+#           SQLAlchemy lanza TypeError si se le pasan, por eso se arman por separado.
+#           pool_pre_ping (DB_POOL_PRE_PING, activado por defecto) descarta conexiones
+#           muertas antes de usarlas. Si se desactiva, los keepalives TCP de abajo y
+#           pool_recycle cubren la mayoría de los casos; si aun así falla una conexión,
+#           SQLAlchemy detecta la desconexión, invalida todo el pool y los siguientes
+#           requests abren conexiones nuevas.
+#           pool_use_lifo=True entrega primero la conexión usada más recientemente:
+#           las conexiones "calientes" se reutilizan y las ociosas expiran con
+#           pool_recycle, reduciendo los procesos backend abiertos en PostgreSQL.
+if settings.DB_USE_NULLPOOL:
+    _pool_kwargs: dict[str, object] = {"poolclass": NullPool}
+else:
+    _pool_kwargs = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_use_lifo": True,
+    }
+
+# ¿Qué? Parámetros de keepalive TCP que psycopg2 pasa a libpq al abrir cada conexión.
+# ¿Para qué? Que el SO detecte sockets muertos (firewall, failover, NAT) en segundo plano.
+# ¿Impacto? Aplican también con NullPool: la conexión a PgBouncer se beneficia igual.
+_connect_args = {
+    "keepalives": 1,
+    "keepalives_idle": settings.DB_TCP_KEEPALIVES_IDLE,
+    "keepalives_interval": settings.DB_TCP_KEEPALIVES_INTERVAL,
+    "keepalives_count": settings.DB_TCP_KEEPALIVES_COUNT,
+}
+
 # ¿Qué? Motor de conexión SQLAlchemy que gestiona el pool de conexiones a PostgreSQL.
 # ¿Para qué? Crear y reutilizar conexiones a la BD de forma eficiente, evitando abrir
 #            una conexión nueva por cada consulta (lo cual sería muy lento).
-# ¿Impacto? El pool_pre_ping=True verifica que la conexión siga viva antes de usarla,
-#           evitando errores por conexiones cerradas tras inactividad prolongada.
+# ¿Impacto? query_cache_size amplía la caché de SQL compilado (default 500) para que las
+#           sentencias frecuentes no se recompilen al ser desalojadas; el lifespan la
+#           precalienta con warm_statement_cache() al arrancar cada worker.
+#           Los INSERT de varias filas (ej: add_all + commit) ya se agrupan por defecto en
+#           un solo INSERT ... VALUES (...), (...) de hasta insertmanyvalues_page_size filas.
+#           No se activa executemany_mode="values_plus_batch": con execute_batch, psycopg2
+#           no reporta un rowcount fiable en UPDATE/DELETE de varias filas y el ORM pierde
+#           la detección de filas obsoletas; además, ningún flujo hace UPDATE/DELETE masivos
+#           con executemany (la purga de tokens es un único DELETE).
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
+    query_cache_size=2000,
+    insertmanyvalues_page_size=1000,
+    connect_args=_connect_args,
     echo=False,  # Cambiar a True para ver las queries SQL en la consola (útil para depuración)
+    **_pool_kwargs,
 )
 
 # ¿Qué? Fábrica de sesiones — cada llamada a SessionLocal() crea una nueva sesión de BD.
@@ -8,15 +8,23 @@ Descripción: Dependencias inyectables de FastAPI — funciones reutilizables qu
           y validar el token JWT manualmente, causando código repetido y propenso a errores.
 """
 
-from collections.abc import Generator
+import hashlib
+import time
+import uuid
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager
+from typing import Any
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Mapper, Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.config import settings
 from app.database import SessionLocal
-from app.models.user import User
+from app.models.user import USER_BY_EMAIL, User
+from app.utils.cache import TTLCache
 from app.utils.security import decode_token
 
 # ¿Qué? Esquema OAuth2 que indica a FastAPI dónde obtener el token del request.
@@ -26,6 +34,132 @@ from app.utils.security import decode_token
 #           Swagger UI usa esta URL para su botón "Authorize".
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# ¿Qué? Caché "access token → id del usuario" para tokens ya validados.
+# ¿Para qué? Evitar decodificar el JWT (HMAC-SHA256 + JSON) y buscar al usuario por email
+#            en cada petición del frontend que reutiliza el mismo token.
+# ¿Impacto? La clave es un hash BLAKE2b del token, no el token en sí — el JWT en claro
+#           no queda retenido en memoria. Cada entrada vive como máximo
+#           TOKEN_CACHE_TTL_SECONDS y nunca más allá del `exp` del propio token.
+_TOKEN_CACHE = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAXSIZE,
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
+# ¿Qué? Caché "id del usuario → columnas del usuario" (snapshot) para el usuario autenticado.
+# ¿Para qué? Tras un acierto en _TOKEN_CACHE solo quedaba un SELECT por clave primaria por
+#            request; con el snapshot, los usuarios activos se resuelven sin ir a la BD.
+# ¿Impacto? Guarda valores planos (no instancias ORM), así que no retiene sesiones ni
+#           conexiones. Se invalida con los eventos after_update/after_delete de abajo.
+_USER_CACHE = TTLCache(
+    maxsize=settings.USER_CACHE_MAXSIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+# ¿Qué? Nombres de las columnas mapeadas de User, calculados una sola vez, SIN hashed_password.
+# ¿Para qué? Construir el snapshot sin inspeccionar el mapper en cada request.
+# ¿Impacto? El hash de la contraseña nunca se sirve desde la caché: en un User reconstruido
+#           desde el snapshot queda sin cargar y, si un flujo lo lee (ej: change_password),
+#           SQLAlchemy lo trae de la BD. Así un cambio de contraseña hecho en OTRO worker no
+#           deja verificar la contraseña anterior durante USER_CACHE_TTL_SECONDS.
+_USER_COLUMNS = tuple(
+    attr.key for attr in inspect(User).column_attrs if attr.key != "hashed_password"
+)
+
+
+def _snapshot_user(user: User) -> dict[str, Any]:
+    """Copia los valores de las columnas de un usuario cargado a un dict plano.
+
+    Args:
+        user: Usuario persistente recién cargado de la BD.
+
+    Returns:
+        Diccionario {nombre de columna: valor} apto para guardar en _USER_CACHE.
+    """
+    return {key: getattr(user, key) for key in _USER_COLUMNS}
+
+
+def _user_from_snapshot(db: Session, snapshot: dict[str, Any]) -> User:
+    """Reconstruye un User persistente en `db` a partir de un snapshot, sin SQL.
+
+    ¿Qué? Crea la instancia sin pasar por __init__, marca cada columna como "ya cargada
+          desde la BD" (set_committed_value), la convierte en detached con su clave de
+          identidad y la une a la sesión con merge(load=False).
+    ¿Para qué? Que el endpoint reciba un User indistinguible de uno recién leído: puede
+              modificarlo y hacer commit (UPDATE por id) y sus relaciones cargan bajo demanda.
+    ¿Impacto? Si la sesión ya tiene ese usuario en su identity map, se usa esa instancia
+              — nunca se sobrescribe un estado más reciente con el snapshot.
+
+    Args:
+        db: Sesión de BD del request.
+        snapshot: Valores de columnas generados por _snapshot_user().
+
+    Returns:
+        Instancia User persistente asociada a `db`.
+    """
+    mapper = inspect(User)
+    existing = db.identity_map.get(
+        mapper.identity_key_from_primary_key((snapshot["id"],))
+    )
+    if existing is not None:
+        return existing
+
+    user = mapper.class_manager.new_instance()
+    for key, value in snapshot.items():
+        set_committed_value(user, key, value)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user_cache(mapper: Mapper[User], connection: Any, target: User) -> None:
+    """Descarta el snapshot de un usuario cuando se modifica o elimina vía ORM.
+
+    ¿Qué? Listener de SQLAlchemy que se ejecuta en el flush de cada UPDATE/DELETE de User.
+    ¿Para qué? Que cambiar el locale, la contraseña o desactivar la cuenta se refleje en el
+              siguiente request servido por este mismo worker, sin esperar el TTL.
+    ¿Impacto? Solo cubre escrituras hechas con el ORM en este proceso; los demás workers
+              (y los UPDATE manuales en la BD) dependen de USER_CACHE_TTL_SECONDS.
+
+    Args:
+        mapper: Mapper de User (requerido por la firma del evento).
+        connection: Conexión usada en el flush (no se usa).
+        target: Usuario modificado o eliminado.
+    """
+    _USER_CACHE.pop(target.id)
+
+
+def get_cached_user_snapshot(user_id: uuid.UUID) -> dict[str, Any] | None:
+    """Retorna el snapshot vigente de un usuario, o None si no está en caché.
+
+    ¿Qué? Consulta _USER_CACHE sin tocar la BD.
+    ¿Para qué? Que otros flujos que ya conocen el id del usuario (ej: el refresh token,
+              que lleva el claim "uid") verifiquen is_active sin un SELECT.
+    ¿Impacto? El snapshot se invalida con cada UPDATE/DELETE de User en este worker y
+              expira en USER_CACHE_TTL_SECONDS para los cambios hechos en otros workers.
+
+    Args:
+        user_id: Id del usuario.
+
+    Returns:
+        Diccionario {nombre de columna: valor}, o None si no hay entrada vigente.
+    """
+    return _USER_CACHE.get(user_id)
+
+
+def cache_user_snapshot(user: User) -> dict[str, Any]:
+    """Guarda (o renueva) el snapshot de un usuario recién cargado de la BD.
+
+    Args:
+        user: Usuario persistente con sus columnas cargadas.
+
+    Returns:
+        El snapshot guardado.
+    """
+    snapshot = _snapshot_user(user)
+    _USER_CACHE.set(user.id, snapshot)
+    return snapshot
+
 
 def get_db() -> Generator[Session, None, None]:
     """Provee una sesión de base de datos para cada request.
@@ -33,17 +167,50 @@ def get_db() -> Generator[Session, None, None]:
     ¿Qué? Generador que crea una sesión de BD, la entrega al endpoint, y la cierra al terminar.
     ¿Para qué? Garantizar que cada request tenga su propia sesión aislada y que siempre
               se cierre correctamente, incluso si ocurre un error.
-    ¿Impacto? El patrón try/finally asegura que la conexión se devuelve al pool SIEMPRE.
-              Sin esto, las conexiones se agotarían y la app dejaría de responder.
+    ¿Impacto? Session implementa el protocolo de context manager: el `with` llama a
+              close() al salir — también si el endpoint lanza una excepción — y la conexión
+              se devuelve al pool SIEMPRE. Sin esto, las conexiones se agotarían y la app
+              dejaría de responder. La dependencia sigue siendo síncrona a propósito: close()
+              puede hacer un ROLLBACK por red, y FastAPI la ejecuta en el threadpool para
+              no bloquear el event loop.
 
     Yields:
         Session: Sesión de SQLAlchemy lista para hacer queries.
     """
-    db = SessionLocal()
-    try:
+    with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+def get_session_factory() -> Callable[[], AbstractContextManager[Session]]:
+    """Provee la fábrica de sesiones para trabajo que corre fuera del request.
+
+    ¿Qué? Retorna SessionLocal sin abrir ninguna sesión.
+    ¿Para qué? Las tareas en segundo plano (BackgroundTasks) se ejecutan después de enviar
+              la respuesta, cuando la sesión de get_db ya se cerró; cada tarea abre la
+              suya con `with session_factory() as db:`.
+    ¿Impacto? Al ser una dependencia, los tests la reemplazan (dependency_overrides) para
+              que la tarea use la sesión de testing con rollback.
+
+    Returns:
+        Callable que crea una sesión usable como context manager.
+    """
+    return SessionLocal
+
+
+def warm_statement_cache() -> None:
+    """Compila y ejecuta una vez las consultas del camino autenticado.
+
+    ¿Qué? Ejecuta USER_BY_EMAIL y la carga por clave primaria (db.get) con valores que
+          no existen, dentro de una sesión que se cierra sin commit (ROLLBACK).
+    ¿Para qué? La caché de SQL compilado del engine es por proceso y arranca vacía: sin
+              esto, el primer request de cada worker paga la compilación de ambas
+              sentencias. También abre la primera conexión del pool antes del tráfico real.
+    ¿Impacto? No modifica datos. Cada worker de Uvicorn calienta su propia caché — no es
+              posible compartirla entre procesos.
+    """
+    with SessionLocal() as db:
+        db.execute(USER_BY_EMAIL, {"email": ""}).first()
+        db.get(User, uuid.UUID(int=0))
 
 
 def get_current_user(
@@ -79,35 +246,61 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    # ¿Qué? Decodificar y verificar el token JWT.
-    # ¿Para qué? Extraer el email del usuario del campo "sub" del payload.
-    # ¿Impacto? Si el token expiró, fue manipulado, o tiene firma incorrecta, decode_token
-    #           retorna None y se lanza la excepción 401.
-    payload = decode_token(token)
-    if not payload:
-        raise credentials_exception
+    # ¿Qué? Buscar primero el token en la caché de tokens ya validados.
+    # ¿Para qué? En un acierto (hit) se omite la decodificación del JWT y la búsqueda
+    #            por email: el usuario se carga por su clave primaria con db.get(),
+    #            que consulta primero el identity map de la sesión.
+    # ¿Impacto? La firma y expiración del token ya se verificaron al cachearlo, y la entrada
+    #           expira antes que el token — un token vencido nunca se acepta desde la caché.
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached_user_id: uuid.UUID | None = _TOKEN_CACHE.get(cache_key)
 
-    # ¿Qué? Verificar que el token es de tipo "access" (no "refresh").
-    # ¿Para qué? Evitar que un refresh token sea usado para acceder a endpoints protegidos.
-    # ¿Impacto? Sin esto, el refresh token (de larga duración) podría usarse como access token,
-    #           anulando la seguridad de tener tokens de corta duración.
-    if payload.get("type") != "access":
-        raise credentials_exception
+    snapshot: dict[str, Any] | None = None
 
-    email: str | None = payload.get("sub")
-    if not email:
-        raise credentials_exception
+    if cached_user_id is not None:
+        # ¿Qué? Resolver el usuario desde el snapshot y, si no hay, por clave primaria.
+        # ¿Para qué? Un acierto en ambas cachés atiende el request sin ninguna consulta a la BD.
+        # ¿Impacto? El snapshot expira en USER_CACHE_TTL_SECONDS como máximo.
+        snapshot = _USER_CACHE.get(cached_user_id)
+        if snapshot is not None:
+            user = _user_from_snapshot(db, snapshot)
+        else:
+            user = db.get(User, cached_user_id)
+    else:
+        # ¿Qué? Decodificar y verificar el token JWT.
+        # ¿Para qué? Extraer el email del usuario del campo "sub" del payload.
+        # ¿Impacto? Si el token expiró, fue manipulado, o tiene firma incorrecta, decode_token
+        #           retorna None y se lanza la excepción 401.
+        #           expected_type="access" rechaza también los refresh tokens: sin esto, el
+        #           refresh token (de larga duración) podría usarse como access token.
+        payload = decode_token(token, expected_type="access")
+        if not payload:
+            raise credentials_exception
 
-    # ¿Qué? Buscar al usuario en la BD por su email.
-    # ¿Para qué? Verificar que el usuario sigue existiendo y está activo.
-    # ¿Impacto? Si el usuario fue eliminado después de obtener el token, esta verificación
-    #           lo detecta y le niega el acceso.
-    stmt = select(User).where(User.email == email)
-    user = db.execute(stmt).scalar_one_or_none()
+        email: str | None = payload.get("sub")
+        if not email:
+            raise credentials_exception
+
+        # ¿Qué? Buscar al usuario en la BD por su email.
+        # ¿Para qué? Verificar que el usuario sigue existiendo y está activo.
+        # ¿Impacto? Si el usuario fue eliminado después de obtener el token, esta verificación
+        #           lo detecta y le niega el acceso.
+        user = db.execute(USER_BY_EMAIL, {"email": email}).scalar_one_or_none()
+
+        # ¿Qué? Recordar que este token pertenece a este usuario.
+        # ¿Para qué? Las siguientes peticiones con el mismo token usan el camino rápido.
+        # ¿Impacto? El TTL se recorta a lo que le queda de vida al token (`exp`).
+        if user:
+            _TOKEN_CACHE.set(
+                cache_key, user.id, ttl=payload.get("exp", 0) - time.time()
+            )
 
     if not user:
         raise credentials_exception
 
+    if snapshot is None:
+        cache_user_snapshot(user)
+
     # ¿Qué? Verificar que la cuenta esté activa.
     # ¿Para qué? Un admin podría desactivar una cuenta; si el usuario tiene un token vigente,
     #            esta verificación le niega el acceso.
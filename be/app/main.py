@@ -7,20 +7,30 @@ Descripción: Punto de entrada de la aplicación FastAPI — configura y arranca
           Todo endpoint, middleware y configuración se conecta aquí.
 """
 
-from contextlib import asynccontextmanager
-from collections.abc import AsyncGenerator
+import asyncio
+import json
 import logging
+import queue
 import sys
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager, suppress
+from logging.handlers import QueueHandler, QueueListener
 
+from anyio import to_thread
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.config import settings
+from app.database import SessionLocal
+from app.dependencies import warm_statement_cache
 from app.routers.auth import router as auth_router
 from app.routers.users import router as users_router
+from app.services.auth_service import purge_expired_reset_tokens
 from app.utils.audit_log import log_rate_limit_hit
+from app.utils.email import close_smtp_connection
 
 # ¿Qué? Importación del limiter desde su módulo dedicado.
 # ¿Para qué? Evitar una importación circular — si el limiter se definiera aquí,
@@ -30,6 +40,46 @@ from app.utils.audit_log import log_rate_limit_hit
 #           tanto main.py como los routers pueden importarlo sin ciclos.
 from app.utils.limiter import limiter
 
+# ¿Qué? Logger de este módulo (hijo del logger "app" que se configura en lifespan).
+# ¿Para qué? Registrar los eventos de arranque y apagado del servidor.
+# ¿Impacto? Reemplaza a print(): los mensajes pasan por el mismo pipeline de logging
+#           que el resto de la app (formato, nivel, destino configurables).
+logger = logging.getLogger(__name__)
+
+
+def _purge_reset_tokens() -> int:
+    """Abre una sesión propia y borra los tokens de reset expirados o usados.
+
+    Returns:
+        Número de tokens eliminados.
+    """
+    with SessionLocal() as db:
+        return purge_expired_reset_tokens(db)
+
+
+async def _purge_reset_tokens_periodically(interval_seconds: int) -> None:
+    """Ejecuta _purge_reset_tokens cada `interval_seconds` hasta que se cancele la tarea.
+
+    ¿Qué? Bucle infinito: espera el intervalo y lanza el DELETE en el threadpool.
+    ¿Para qué? Mantener pequeña la tabla password_reset_tokens sin depender de un cron
+              externo: cada worker la limpia mientras la app está arriba.
+    ¿Impacto? El DELETE es idempotente, así que varios workers pueden ejecutarlo sin
+              coordinarse. Un error de BD solo se registra: la tarea sigue viva y lo
+              reintenta en el siguiente intervalo.
+
+    Args:
+        interval_seconds: Segundos entre limpiezas (RESET_TOKEN_PURGE_INTERVAL_SECONDS).
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            deleted = await to_thread.run_sync(_purge_reset_tokens)
+        except SQLAlchemyError as exc:
+            logger.warning("⚠️ No se pudieron purgar los tokens de reset: %s", exc)
+        else:
+            if deleted:
+                logger.info("🧹 Tokens de reset purgados: %d", deleted)
+
 
 # ¿Qué? Función de ciclo de vida (lifespan) que se ejecuta al iniciar y al cerrar la app.
 # ¿Para qué? Realizar tareas de inicialización (ej: verificar conexión a BD) al arrancar
@@ -46,25 +96,97 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
               El código después de `yield` se ejecuta al CERRAR.
     """
     # --- Startup ---
-    # ¿Qué? Configura el logger del paquete `app` con un StreamHandler a stdout.
+    # ¿Qué? Configura el logger del paquete `app` con un QueueHandler cuyo QueueListener
+    #       escribe en stdout desde un hilo propio.
     # ¿Para qué? Uvicorn NO agrega handlers al root logger — solo configura sus propios
     #            loggers (uvicorn, uvicorn.access). Sin un handler explícito, los logs
     #            INFO/ERROR de `app.utils.email`, `app.services.*`, etc. se pierden.
+    #            Con la cola, el hilo que atiende el request solo encola el registro
+    #            (operación O(1)) y nunca espera el lock de stdout ni la escritura a disco.
     # ¿Impacto? Igual que audit_log.py que sí añade su StreamHandler, esto garantiza
     #           que `logger.info/error/warning` del paquete `app` aparezcan en
-    #           `docker logs nn_auth_be`.
+    #           `docker logs nn_auth_be`, sin serializar los requests en la escritura.
     app_logger = logging.getLogger("app")
     app_logger.setLevel(logging.INFO)
+    queue_handler: QueueHandler | None = None
+    listener: QueueListener | None = None
     if not app_logger.handlers:
+        log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
         _handler = logging.StreamHandler(sys.stdout)
-        _handler.setFormatter(logging.Formatter("%(name)s - %(levelname)s - %(message)s"))
-        app_logger.addHandler(_handler)
+        _handler.setFormatter(
+            logging.Formatter("%(name)s - %(levelname)s - %(message)s")
+        )
+        listener = QueueListener(log_queue, _handler)
+        listener.start()
+        queue_handler = QueueHandler(log_queue)
+        app_logger.addHandler(queue_handler)
         app_logger.propagate = False
-    print("🚀 NN Auth System — Backend iniciando...")
-    print(f"📡 CORS habilitado para: {settings.FRONTEND_URL}")
+
+    # ¿Qué? Ajusta el tamaño del threadpool de AnyIO a la capacidad del pool de conexiones.
+    # ¿Para qué? Los endpoints `def` (síncronos) corren en este threadpool y cada uno usa
+    #            una sesión de BD síncrona. Con más hilos que conexiones, los hilos sobrantes
+    #            quedan bloqueados en el checkout del pool y fallan por DB_POOL_TIMEOUT;
+    #            con menos hilos, las conexiones del pool quedan ociosas.
+    # ¿Impacto? La concurrencia real de requests a la BD queda igual al tamaño del pool
+    #           (DB_POOL_SIZE + DB_MAX_OVERFLOW) y los requests excedentes esperan en la
+    #           cola de AnyIO en lugar de producir errores 500 por timeout.
+    to_thread.current_default_thread_limiter().total_tokens = (
+        settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    )
+    logger.info("🚀 NN Auth System — Backend iniciando...")
+    logger.info("📡 CORS habilitado para: %s", settings.FRONTEND_URL)
+
+    # ¿Qué? Calienta la caché de sentencias compiladas antes del primer request.
+    # ¿Para qué? Que el primer login/GET /me de cada worker no pague la compilación del SQL.
+    # ¿Impacto? Corre en el threadpool (es I/O síncrono). Si la BD aún no responde, solo se
+    #           registra un warning: la app arranca igual y compila en el primer request.
+    try:
+        await to_thread.run_sync(warm_statement_cache)
+    except SQLAlchemyError as exc:
+        logger.warning("⚠️ No se pudo precalentar la caché de sentencias: %s", exc)
+
+    # ¿Qué? Genera el esquema OpenAPI una vez, al arrancar.
+    # ¿Para qué? app.openapi() recorre todas las rutas y los JSON Schema de sus modelos
+    #            (UserResponse, TokenResponse, ...) y guarda el resultado en
+    #            app.openapi_schema; sin esto, ese trabajo lo paga el primer request a
+    #            /openapi.json (o a /docs) de cada worker.
+    # ¿Impacto? Las peticiones siguientes reutilizan el dict ya construido. Las rutas ya
+    #           están registradas cuando corre el lifespan, así que el esquema es completo.
+    app.openapi()
+
+    # ¿Qué? Lanza la limpieza periódica de tokens de reset como tarea de asyncio.
+    # ¿Para qué? Que los tokens expirados o usados no se acumulen entre despliegues.
+    # ¿Impacto? La tarea duerme casi todo el tiempo; el DELETE corre en el threadpool y
+    #           no bloquea el event loop. Se cancela al apagar la app.
+    purge_task: asyncio.Task[None] | None = None
+    if settings.RESET_TOKEN_PURGE_INTERVAL_SECONDS > 0:
+        purge_task = asyncio.create_task(
+            _purge_reset_tokens_periodically(
+                settings.RESET_TOKEN_PURGE_INTERVAL_SECONDS
+            )
+        )
+
     yield
     # --- Shutdown ---
-    print("🛑 NN Auth System — Backend cerrando...")
+    logger.info("🛑 NN Auth System — Backend cerrando...")
+
+    if purge_task is not None:
+        purge_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await purge_task
+
+    # ¿Qué? Cierra la conexión SMTP reutilizada entre envíos de email (si se abrió).
+    # ¿Para qué? Enviar QUIT al servidor en lugar de cortar el socket al terminar el proceso.
+    # ¿Impacto? QUIT es una operación de red bloqueante: se ejecuta en el threadpool.
+    await to_thread.run_sync(close_smtp_connection)
+
+    # ¿Qué? Detiene el QueueListener (vacía la cola pendiente) y retira el QueueHandler.
+    # ¿Para qué? Que ningún mensaje encolado se pierda al apagar, y que un nuevo arranque
+    #            en el mismo proceso (ej: tests con TestClient) vuelva a configurarlo.
+    # ¿Impacto? Sin esto, los registros quedarían atrapados en una cola que nadie consume.
+    if listener is not None and queue_handler is not None:
+        listener.stop()
+        app_logger.removeHandler(queue_handler)
 
 
 # ¿Qué? Instancia principal de la aplicación FastAPI.
@@ -77,6 +199,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 # En producción, /docs y /redoc se deshabilitan para evitar exponer la superficie
 # de ataque de la API a cualquier visitante sin autenticación.
 # En desarrollo y testing se mantienen activos para facilitar el trabajo del equipo.
+#
+# Serialización JSON: NO se configura default_response_class=ORJSONResponse.
+# Desde FastAPI 0.130+, cuando el endpoint declara response_model (todos los de esta API
+# lo hacen), FastAPI serializa directamente a bytes con pydantic-core (Rust), sin pasar
+# por el módulo json de la stdlib. Ese camino rápido solo se usa con la clase de respuesta
+# POR DEFECTO — cambiarla a ORJSONResponse (hoy deprecada) lo desactivaría y volvería
+# a convertir cada modelo a dict antes de serializarlo.
 _is_production = settings.ENVIRONMENT == "production"
 app = FastAPI(
     title="NN Auth System",
@@ -112,7 +241,9 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 # ❌ INCORRECTO: allow_methods=["*"] y allow_headers=["*"] son excesivamente permisivos.
 #    Un XSS podría explotar métodos como DELETE o PUT con headers arbitrarios.
 # ✅ CORRECTO: Especificar exactamente qué métodos y headers necesita la app.
-#    Esta API solo usa GET y POST; los headers son Content-Type y Authorization.
+#    Esta API usa GET, POST y PATCH; los headers son Content-Type y Authorization.
+#    Con listas fijas, Starlette responde el preflight con headers precalculados en lugar
+#    de reflejar lo que pida el navegador en cada OPTIONS.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -122,11 +253,19 @@ app.add_middleware(
     # ¿Qué? Solo los métodos HTTP que realmente usa la API.
     # ¿Para qué? Prevenir que un XSS cause peticiones DELETE/PUT desde el origen permitido.
     # ¿Impacto? Si un endpoint necesita PUT o DELETE en el futuro, se agrega aquí explícitamente.
-    allow_methods=["GET", "POST"],
+    #           PATCH es necesario para PATCH /api/v1/users/me/locale — sin él, el navegador
+    #           rechaza el preflight y el cambio de idioma nunca llega al backend.
+    allow_methods=["GET", "POST", "PATCH"],
     # ¿Qué? Solo los headers que la API necesita recibir del frontend.
     # ¿Para qué? Limitar la superficie de ataque — headers arbitrarios no deben aceptarse.
     # ¿Impacto? Content-Type para JSON, Authorization para JWT. Nada más es necesario.
     allow_headers=["Content-Type", "Authorization"],
+    # ¿Qué? Segundos que el navegador puede cachear la respuesta del preflight (OPTIONS).
+    # ¿Para qué? Sin esto (default de Starlette: 600 s), el navegador repite el OPTIONS
+    #            previo a cada POST/PATCH con JSON o Authorization cada 10 minutos.
+    # ¿Impacto? 86400 s (24 h) elimina casi todo el tráfico OPTIONS. Los navegadores aplican
+    #           su propio tope (Chrome: 2 h), así que un valor mayor no tiene efecto extra.
+    max_age=86400,
 )
 
 
@@ -198,12 +337,27 @@ app.include_router(users_router)
 # ────────────────────────────
 # 📍 Endpoint de salud (health check)
 # ────────────────────────────
+
+# ¿Qué? Cuerpo JSON del health check serializado UNA vez al importar el módulo.
+# ¿Para qué? Los balanceadores de carga y Docker consultan este endpoint varias veces por
+#            segundo; la respuesta nunca cambia, así que no tiene sentido validarla y
+#            serializarla a JSON en cada petición.
+# ¿Impacto? Cada hit solo copia estos bytes a la respuesta — sin asignar dicts ni strings.
+_HEALTH_PAYLOAD = json.dumps(
+    {
+        "status": "healthy",
+        "project": "NN Auth System",
+        "version": "0.1.0",
+    }
+).encode()
+
+
 @app.get(
     "/api/v1/health",
     tags=["health"],
     summary="Verificar estado del servidor",
 )
-async def health_check() -> dict[str, str]:
+async def health_check() -> Response:
     """Endpoint de verificación de salud del servidor.
 
     ¿Qué? Retorna un JSON simple indicando que el servidor está activo.
@@ -211,12 +365,10 @@ async def health_check() -> dict[str, str]:
               verificar rápidamente que el backend responde.
     ¿Impacto? Si este endpoint no responde, significa que el servidor está caído.
               Es el primer endpoint a probar tras levantar el servidor.
+              Es `async def` sin await: Starlette lo ejecuta directo en el event loop,
+              sin pasar por el threadpool.
 
     Returns:
-        Diccionario con el estado del servidor y el nombre del proyecto.
+        Respuesta JSON precalculada con el estado del servidor y el nombre del proyecto.
     """
-    return {
-        "status": "healthy",
-        "project": "NN Auth System",
-        "version": "0.1.0",
-    }
+    return Response(content=_HEALTH_PAYLOAD, media_type="application/json")
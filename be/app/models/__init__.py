@@ -7,13 +7,26 @@ Descripción: Paquete de modelos ORM — exporta todos los modelos para facilita
           generadas estarían vacías (uno de los errores más comunes al configurar Alembic).
 """
 
-# ¿Qué? Importaciones explícitas de todos los modelos ORM del proyecto.
-# ¿Para qué? Al importar este paquete, Python ejecuta estos imports y SQLAlchemy
-#            registra los modelos en Base.metadata (el registro central de tablas).
-# ¿Impacto? Si se agrega un nuevo modelo y NO se importa aquí, Alembic no lo verá
-#           y no generará la migración correspondiente.
+import importlib
+import pkgutil
+
+# ¿Qué? Importaciones explícitas de los modelos ORM del proyecto.
+# ¿Para qué? Permitir `from app.models import User` y dar a los editores/linters
+#            nombres concretos para autocompletado y análisis estático.
+# ¿Impacto? Ya NO son la única forma de registrar modelos — ver el escaneo de abajo.
 from app.models.user import User
 from app.models.password_reset_token import PasswordResetToken
 from app.models.email_verification_token import EmailVerificationToken
 
+# ¿Qué? Escaneo de todos los módulos del paquete app/models/ al importarlo.
+# ¿Para qué? SQLAlchemy solo registra un modelo en Base.metadata cuando su módulo se
+#            importa. Depender de una lista manual es frágil: si alguien crea un modelo
+#            nuevo y olvida importarlo aquí, `alembic revision --autogenerate` genera una
+#            migración vacía (o peor, una que intenta BORRAR la tabla) sin ningún aviso.
+# ¿Impacto? Cualquier archivo nuevo en app/models/ queda registrado automáticamente.
+#           Los módulos que empiezan con "_" se ignoran (helpers privados).
+for _module in pkgutil.iter_modules(__path__):
+    if not _module.name.startswith("_"):
+        importlib.import_module(f"{__name__}.{_module.name}")
+
 __all__ = ["User", "PasswordResetToken", "EmailVerificationToken"]
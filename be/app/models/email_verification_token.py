@@ -13,11 +13,12 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, String, false, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
+from app.utils.ids import uuid7
 
 # ¿Qué? Import condicional del modelo User solo para type hints.
 # ¿Para qué? Romper la importación circular User ↔ EmailVerificationToken.
@@ -47,10 +48,12 @@ class EmailVerificationToken(Base):
     # ¿Qué? Identificador único del registro de token.
     # ¿Para qué? Clave primaria de la tabla.
     # ¿Impacto? UUID evita colisiones y no revela información secuencial.
+    #           uuid7 (ordenado por tiempo) hace que cada INSERT se agregue al final del
+    #           índice de la clave primaria en lugar de en una página aleatoria.
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
     )
 
     # ¿Qué? Referencia al usuario al que pertenece este token de verificación.
@@ -85,9 +88,11 @@ class EmailVerificationToken(Base):
     # ¿Qué? Indicador de si este token ya fue utilizado para verificar el email.
     # ¿Para qué? Evitar que el mismo enlace sea clickeado múltiples veces con efecto.
     # ¿Impacto? Un token marcado como used=True es rechazado aunque no haya expirado.
+    #           server_default=false() refleja el DEFAULT creado por la migración.
     used: Mapped[bool] = mapped_column(
         Boolean,
         default=False,
+        server_default=false(),
         nullable=False,
     )
 
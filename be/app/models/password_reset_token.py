@@ -18,6 +18,7 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
+from app.utils.ids import uuid7
 
 # ¿Qué? Import condicional del modelo User solo para type hints.
 # ¿Para qué? Romper la importación circular User ↔ PasswordResetToken.
@@ -46,10 +47,12 @@ class PasswordResetToken(Base):
     # ¿Qué? Identificador único del registro de token.
     # ¿Para qué? Clave primaria de la tabla.
     # ¿Impacto? UUID evita colisiones y no revela información secuencial.
+    #           uuid7 (ordenado por tiempo) hace que cada INSERT se agregue al final del
+    #           índice de la clave primaria en lugar de en una página aleatoria.
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
     )
 
     # ¿Qué? Referencia al usuario que solicitó el reset de contraseña.
@@ -63,13 +66,15 @@ class PasswordResetToken(Base):
         nullable=False,
     )
 
-    # ¿Qué? Token único que se envía en el email de recuperación.
-    # ¿Para qué? Actuar como "contraseña temporal" de un solo uso para verificar
-    #            que quien solicita el cambio tiene acceso al email del usuario.
-    # ¿Impacto? UNIQUE + INDEX: cada token es irrepetible y las búsquedas son rápidas.
-    #           Se genera como UUID aleatorio — prácticamente imposible de adivinar.
-    token: Mapped[str] = mapped_column(
-        String(255),
+    # ¿Qué? Hash SHA-256 (64 caracteres hex) del token que se envía en el email de recuperación.
+    # ¿Para qué? El token en claro actúa como "contraseña temporal" de un solo uso y SOLO
+    #            viaja en el email; en la BD se guarda su huella, igual que con las contraseñas.
+    # ¿Impacto? Si la BD se filtra, los hashes no sirven para restablecer contraseñas ajenas
+    #           (OWASP A02 — Cryptographic Failures). Además, 64 caracteres fijos en lugar de
+    #           hasta 255 hacen el índice UNIQUE más pequeño y las búsquedas más rápidas.
+    #           No hace falta sal ni un hash lento: el token ya tiene 256 bits de entropía.
+    token_hash: Mapped[str] = mapped_column(
+        String(64),
         unique=True,
         index=True,
         nullable=False,
@@ -124,12 +129,12 @@ class PasswordResetToken(Base):
     def __repr__(self) -> str:
         """Representación legible del token para debugging.
 
-        ¿Qué? Cadena descriptiva del token — NUNCA mostrar el token completo por seguridad.
+        ¿Qué? Cadena descriptiva del token — NUNCA mostrar el hash completo por seguridad.
         ¿Para qué? Debugging seguro sin exponer información sensible.
-        ¿Impacto? Mostrar solo los primeros 8 caracteres del token es suficiente para identificación.
+        ¿Impacto? Mostrar solo los primeros 8 caracteres del hash es suficiente para identificación.
         """
-        token_preview = self.token[:8] if self.token else "N/A"
+        token_preview = self.token_hash[:8] if self.token_hash else "N/A"
         return (
             f"PasswordResetToken(id={self.id}, user_id={self.user_id}, "
-            f"token={token_preview}..., used={self.used})"
+            f"token_hash={token_preview}..., used={self.used})"
         )
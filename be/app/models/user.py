@@ -13,11 +13,21 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, String, func
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    DateTime,
+    String,
+    bindparam,
+    false,
+    func,
+    select,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
+from app.utils.ids import uuid7
 
 # ¿Qué? Imports condicionales que solo se ejecutan durante el análisis estático (mypy/pyright).
 # ¿Para qué? Romper la importación circular entre User ↔ PasswordResetToken ↔
@@ -36,7 +46,7 @@ class User(Base):
               SQLAlchemy traduce operaciones Python (crear User, query, update)
               a sentencias SQL automáticamente.
     ¿Impacto? Almacena las credenciales y datos de perfil de cada usuario.
-              La contraseña se guarda como hash bcrypt (columna hashed_password),
+              La contraseña se guarda como hash argon2id (columna hashed_password),
               NUNCA en texto plano.
     """
 
@@ -45,6 +55,19 @@ class User(Base):
     # ¿Impacto? Convención: plural, snake_case (users, no User ni usuario).
     __tablename__ = "users"
 
+    # ¿Qué? Restricción CHECK con la forma mínima de un email (algo@dominio.tld).
+    # ¿Para qué? Que la BD sea la fuente de verdad del formato: login y forgot-password
+    #            validan solo con la misma expresión (LookupEmail en schemas/user.py) y
+    #            dejan la validación completa (EmailStr) para el registro.
+    # ¿Impacto? Ninguna vía (script, admin, bug) puede guardar un email sin @ o sin
+    #           dominio. `~` es el operador de expresiones regulares POSIX de PostgreSQL.
+    __table_args__ = (
+        CheckConstraint(
+            r"email ~ '^[^@\s]+@[^@\s]+\.[^@\s]+$'",
+            name="ck_users_email_format",
+        ),
+    )
+
     # ────────────────────────────
     # 📌 Columnas
     # ────────────────────────────
@@ -53,10 +76,14 @@ class User(Base):
     # ¿Para qué? Identificar cada usuario de forma única e inmutable.
     # ¿Impacto? UUID es mejor que autoincremental para seguridad — no revela
     #           cuántos usuarios hay ni permite adivinar IDs secuenciales.
+    #           uuid7 (ordenado por tiempo) hace que cada INSERT se agregue al final del
+    #           índice de la clave primaria en lugar de en una página aleatoria. Sus 74 bits
+    #           aleatorios siguen haciendo inviable adivinar un id; solo expone la fecha
+    #           de registro, que ya es pública vía created_at en /users/me.
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
     )
 
     # ¿Qué? Dirección de email del usuario.
@@ -64,6 +91,11 @@ class User(Base):
     #            emails de recuperación de contraseña.
     # ¿Impacto? UNIQUE evita cuentas duplicadas. INDEX acelera las búsquedas
     #           por email (operación muy frecuente en login).
+    #           No se agrega un índice parcial `WHERE is_active`: login_user y
+    #           get_current_user buscan SOLO por email y necesitan encontrar también las
+    #           cuentas inactivas para responder 403 "Cuenta desactivada" (en vez de 401).
+    #           El índice UNIQUE ya resuelve la igualdad con una sola fila; un índice
+    #           parcial no lo usaría ninguna consulta y solo encarecería cada INSERT/UPDATE.
     email: Mapped[str] = mapped_column(
         String(255),
         unique=True,
@@ -87,11 +119,12 @@ class User(Base):
         nullable=False,
     )
 
-    # ¿Qué? Hash bcrypt de la contraseña del usuario.
+    # ¿Qué? Hash argon2id de la contraseña del usuario (o bcrypt, en cuentas antiguas).
     # ¿Para qué? Almacenar la contraseña de forma segura — el hash es irreversible,
     #            por lo que incluso si la BD es comprometida, las contraseñas no se exponen.
     # ¿Impacto? NUNCA almacenar la contraseña en texto plano aquí.
-    #           El hash bcrypt tiene ~60 caracteres, pero usamos 255 por seguridad futura.
+    #           Un hash argon2id tiene ~97 caracteres y uno bcrypt ~60; 255 deja margen
+    #           para cambiar de algoritmo sin migrar la columna.
     hashed_password: Mapped[str] = mapped_column(
         String(255),
         nullable=False,
@@ -113,9 +146,12 @@ class User(Base):
     #            Sin verificación, cualquiera podría registrarse con el email de otra persona.
     # ¿Impacto? Default False = al registrarse, el usuario NO puede iniciar sesión hasta
     #           hacer clic en el enlace de verificación enviado a su email.
+    #           server_default=false() refleja el DEFAULT que creó la migración
+    #           c3d5e7f9a1b2, para que autogenerate no lo marque como diferencia.
     is_email_verified: Mapped[bool] = mapped_column(
         Boolean,
         default=False,
+        server_default=false(),
         nullable=False,
     )
 
@@ -192,3 +228,15 @@ class User(Base):
         ¿Impacto? NUNCA incluir hashed_password en __repr__ por seguridad.
         """
         return f"User(id={self.id}, email={self.email}, is_active={self.is_active})"
+
+
+# ¿Qué? Sentencia SELECT del usuario por email, construida UNA vez al importar el módulo.
+# ¿Para qué? Es la consulta más frecuente del backend (login, refresh, get_current_user,
+#            registro, forgot-password). Construir select(User).where(...) en cada llamada
+#            crea nuevos objetos de expresión y obliga a SQLAlchemy a recalcular su clave
+#            de caché; con bindparam, todos los flujos reutilizan la misma sentencia
+#            cambiando solo el valor del parámetro.
+# ¿Impacto? Un solo SQL idéntico en todos los flujos → una sola entrada en la caché de
+#           sentencias compiladas del engine (query_cache_size), que warm_statement_cache()
+#           precalienta al arrancar. Se ejecuta como db.execute(USER_BY_EMAIL, {"email": ...}).
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
@@ -9,10 +9,14 @@ Descripción: Endpoints de autenticación — registro, login, refresh, cambio y
           la lógica de negocio al auth_service.
 """
 
-from fastapi import APIRouter, Depends, Request, status
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, status
 from sqlalchemy.orm import Session
 
-from app.dependencies import get_current_user, get_db
+from app.dependencies import get_current_user, get_db, get_session_factory
+from app.routers.fast_route import FastRoute
 from app.utils.limiter import limiter
 from app.models.user import User
 from app.schemas.user import (
@@ -35,6 +39,10 @@ from app.services import auth_service
 router = APIRouter(
     prefix="/api/v1/auth",
     tags=["auth"],
+    # ¿Qué? Clase de ruta que serializa los schemas retornados sin revalidarlos.
+    # ¿Para qué? Todos los endpoints de este router retornan schemas construidos por el
+    #            backend; ver routers/fast_route.py.
+    route_class=FastRoute,
 )
 
 
@@ -52,6 +60,7 @@ router = APIRouter(
 async def register(
     request: Request,
     user_data: UserCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ) -> UserResponse:
     """Registra un nuevo usuario en el sistema.
@@ -65,13 +74,17 @@ async def register(
 
     Args:
         user_data: Datos del nuevo usuario (validados por Pydantic).
+        background_tasks: Cola de tareas de FastAPI; el email de verificación se envía
+            después de responder.
         db: Sesión de BD (inyectada por FastAPI).
 
     Returns:
         Datos del usuario creado (sin contraseña).
     """
-    user = await auth_service.register_user(db=db, user_data=user_data)
-    return UserResponse.model_validate(user)
+    user = await auth_service.register_user(
+        db=db, user_data=user_data, background_tasks=background_tasks
+    )
+    return UserResponse.from_user(user)
 
 
 # ¿Qué? Límite de 10 intentos de login por minuto por IP.
@@ -143,12 +156,19 @@ def refresh_token(
     )
 
 
+# ¿Qué? Límite de 5 cambios de contraseña por minuto por IP.
+# ¿Para qué? Cada intento verifica la contraseña actual con argon2id (CPU + memoria) y
+#            ocupa un turno de hashing compartido con /login; con un access token robado
+#            se podría adivinar la contraseña actual o saturar esos turnos.
+# ¿Impacto? Un usuario legítimo cambia su contraseña una vez; 5/minute no le afecta.
 @router.post(
     "/change-password",
     response_model=MessageResponse,
     summary="Cambiar contraseña (usuario autenticado)",
 )
-def change_password(
+@limiter.limit("5/minute")
+async def change_password(
+    request: Request,
     password_data: ChangePasswordRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -160,6 +180,8 @@ def change_password(
     ¿Impacto? Requires Depends(get_current_user) = endpoint protegido.
               Solo funciona con un access_token válido en el header Authorization.
               Verifica la contraseña actual como capa extra de seguridad.
+              Es `async def`: la verificación y el hash nuevo corren en el threadpool,
+              no en el event loop.
 
     Args:
         password_data: Contraseña actual + nueva contraseña.
@@ -169,7 +191,7 @@ def change_password(
     Returns:
         Mensaje de confirmación.
     """
-    auth_service.change_password(
+    await auth_service.change_password(
         db=db,
         user=current_user,
         password_data=password_data,
@@ -180,9 +202,6 @@ def change_password(
 # ¿Qué? Límite de 5 solicitudes de recuperación por minuto por IP.
 # ¿Para qué? El endpoint forgot-password envía emails — sin límite se convierte
 #            en un vector de spam masivo (OWASP A04 — Insecure Design).
-#            También previene la enumeración de usuarios por timing (aunque el
-#            endpoint retorna respuesta genérica, la diferencia de velocidad podría
-#            revelar si el email existe o no — el rate limit reduce este riesgo).
 # ¿Impacto? 5/minute es un límite razonable — un usuario legítimo raramente
 #           necesita más de 1 solicitud de recuperación por hora.
 @router.post(
@@ -194,7 +213,10 @@ def change_password(
 async def forgot_password(
     request: Request,
     request_data: ForgotPasswordRequest,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    session_factory: Callable[[], AbstractContextManager[Session]] = Depends(
+        get_session_factory
+    ),
 ) -> MessageResponse:
     """Solicita un email de recuperación de contraseña.
 
@@ -202,16 +224,23 @@ async def forgot_password(
     ¿Para qué? Iniciar el flujo de "olvidé mi contraseña".
     ¿Impacto? SIEMPRE retorna el mismo mensaje de éxito, sin importar si el email está
               registrado o no. Esto es intencional: previene la enumeración de usuarios.
-              Un atacante no puede saber si un email está registrado basándose en la respuesta.
+              La búsqueda, el INSERT del token y el envío del email corren en segundo plano
+              después de responder, así que la latencia tampoco delata si el email existe
+              (timing attack) y el request no retiene una conexión de BD.
 
     Args:
         request_data: Email del usuario.
-        db: Sesión de BD (inyectada por FastAPI).
+        background_tasks: Cola de tareas que Starlette ejecuta tras enviar la respuesta.
+        session_factory: Fábrica de sesiones para la tarea (inyectada por FastAPI).
 
     Returns:
         Mensaje genérico de confirmación.
     """
-    await auth_service.request_password_reset(db=db, email=request_data.email)
+    background_tasks.add_task(
+        auth_service.request_password_reset,
+        email=request_data.email,
+        session_factory=session_factory,
+    )
     return MessageResponse(
         message="Si el email está registrado, recibirás un enlace de recuperación"
     )
@@ -0,0 +1,150 @@
+"""
+Módulo: routers/fast_route.py
+Descripción: Clase de ruta (APIRoute) que serializa directamente los modelos Pydantic
+             que retornan los endpoints, sin pasar por la validación de respuesta de FastAPI.
+¿Para qué? Los endpoints de auth y users retornan objetos que construye el propio backend
+           (UserResponse, TokenResponse, MessageResponse). FastAPI los vuelve a pasar por
+           el `response_model` — y en endpoints `def` lo hace con un salto extra al
+           threadpool — antes de convertirlos a JSON.
+¿Impacto? `response_model` se sigue declarando en cada endpoint: Swagger/OpenAPI documenta
+          la respuesta igual que antes. Lo único que cambia es que el JSON se genera con el
+          serializador del propio modelo (pydantic-core, en Rust) en un solo paso.
+          Solo se omite la validación cuando el valor retornado es exactamente del tipo
+          `response_model`; cualquier otro valor se valida y filtra como siempre.
+"""
+
+import functools
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import Response
+from fastapi.routing import APIRoute
+
+# ¿Qué? Nombre del parámetro extra que el wrapper agrega a la firma del endpoint.
+# ¿Para qué? Que FastAPI le inyecte la Response temporal del request (la misma que recibe
+#            un endpoint que declara `response: Response`), con el status y los headers que
+#            hayan fijado el endpoint o sus dependencias.
+# ¿Impacto? El nombre no colisiona con parámetros reales y nunca llega al endpoint original.
+_SUB_RESPONSE_PARAM = "_fast_route_response"
+
+
+def _to_response(result: Any, route: APIRoute, sub_response: Response) -> Any:
+    """Convierte el modelo declarado como response_model en una Response JSON ya serializada.
+
+    ¿Qué? Si el endpoint retornó EXACTAMENTE una instancia de su `response_model`, la
+          serializa con su propio __pydantic_serializer__ y la envuelve en una Response.
+    ¿Para qué? Cuando un endpoint retorna una Response, FastAPI la entrega tal cual y omite
+              serialize_response() (validación + serialización contra response_model).
+    ¿Impacto? Cualquier otro valor — otro modelo (incluida una subclase con campos extra),
+              un dict, una Response o None — sigue el camino normal de FastAPI, que valida
+              y filtra contra response_model. El status y los headers fijados en la
+              Response temporal se copian igual que lo hace FastAPI.
+
+    Args:
+        result: Valor retornado por el endpoint.
+        route: Ruta a la que pertenece el endpoint (response_model y status_code resueltos).
+        sub_response: Response temporal inyectada por FastAPI para este request.
+
+    Returns:
+        Una Response con el JSON del modelo, o `result` sin modificar.
+    """
+    if route.response_model is None or type(result) is not route.response_model:
+        return result
+    response = Response(
+        content=result.__pydantic_serializer__.to_json(result),
+        status_code=sub_response.status_code or route.status_code or 200,
+        media_type="application/json",
+    )
+    response.headers.raw.extend(sub_response.headers.raw)
+    return response
+
+
+def _wrap_endpoint(endpoint: Callable[..., Any], route: APIRoute) -> Callable[..., Any]:
+    """Envuelve un endpoint (sync o async) para aplicar _to_response a su resultado.
+
+    ¿Qué? functools.wraps copia nombre, docstring y anotaciones; __signature__ expone la
+          firma original (más _SUB_RESPONSE_PARAM si hace falta), que FastAPI lee para
+          resolver parámetros, Depends y body.
+    ¿Para qué? Mantener el endpoint intacto: los routers no cambian su código.
+    ¿Impacto? Un endpoint `def` sigue siendo síncrono (corre en el threadpool) y uno
+              `async def` sigue siendo corrutina — FastAPI los trata igual que antes.
+
+    Args:
+        endpoint: Función del endpoint (posiblemente ya decorada por slowapi).
+        route: Ruta que registra el endpoint; se consulta en cada request, cuando
+               APIRoute ya resolvió response_model y status_code.
+
+    Returns:
+        La función envuelta.
+    """
+    # ¿Qué? include_router() vuelve a crear cada ruta con el endpoint YA envuelto; se
+    #       envuelve siempre el original para no duplicar el parámetro ni el trabajo.
+    endpoint = getattr(endpoint, "_fast_route_endpoint", endpoint)
+
+    # ¿Qué? FastAPI inyecta la Response temporal en UN solo parámetro por endpoint: si el
+    #       endpoint ya declara `response: Response` se reutiliza ese; si no, se agrega
+    #       _SUB_RESPONSE_PARAM a la firma y se quita de los kwargs antes de llamarlo.
+    signature = inspect.signature(endpoint)
+    params = list(signature.parameters.values())
+    declared = next(
+        (
+            param.name
+            for param in params
+            if isinstance(param.annotation, type)
+            and issubclass(param.annotation, Response)
+        ),
+        None,
+    )
+
+    def pop_sub_response(kwargs: dict[str, Any]) -> Response:
+        if declared is not None:
+            return kwargs[declared]
+        return kwargs.pop(_SUB_RESPONSE_PARAM)
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def wrapped(*args: Any, **kwargs: Any) -> Any:
+            sub_response = pop_sub_response(kwargs)
+            return _to_response(await endpoint(*args, **kwargs), route, sub_response)
+
+    else:
+
+        @functools.wraps(endpoint)
+        def wrapped(*args: Any, **kwargs: Any) -> Any:
+            sub_response = pop_sub_response(kwargs)
+            return _to_response(endpoint(*args, **kwargs), route, sub_response)
+
+    if declared is None:
+        extra = inspect.Parameter(
+            _SUB_RESPONSE_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Response
+        )
+        if params and params[-1].kind is inspect.Parameter.VAR_KEYWORD:
+            params.insert(len(params) - 1, extra)
+        else:
+            params.append(extra)
+    wrapped.__signature__ = signature.replace(parameters=params)  # type: ignore[attr-defined]
+    wrapped._fast_route_endpoint = endpoint  # type: ignore[attr-defined]
+    return wrapped
+
+
+class FastRoute(APIRoute):
+    """APIRoute que omite la revalidación del `response_model` para modelos ya construidos.
+
+    ¿Qué? Reemplaza el endpoint por su versión envuelta antes de que APIRoute lo registre.
+    ¿Para qué? Usarse como `APIRouter(route_class=FastRoute)` en los routers cuyos endpoints
+              retornan schemas de respuesta construidos por el backend.
+    ¿Impacto? Ahorra la validación de la respuesta y, en endpoints `def`, un salto al
+              threadpool por request — solo cuando el endpoint retorna su response_model.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        """Registra la ruta con el endpoint envuelto.
+
+        Args:
+            path: Ruta relativa del endpoint (ej: "/login").
+            endpoint: Función del endpoint.
+            **kwargs: Resto de argumentos de APIRoute (response_model, status_code, etc.).
+        """
+        super().__init__(path, _wrap_endpoint(endpoint, self), **kwargs)
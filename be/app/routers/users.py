@@ -11,6 +11,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.dependencies import get_current_user, get_db
+from app.routers.fast_route import FastRoute
 from app.models.user import User
 from app.schemas.user import UpdateLocaleRequest, UserResponse
 from app.services.auth_service import update_user_locale
@@ -22,6 +23,10 @@ from app.services.auth_service import update_user_locale
 router = APIRouter(
     prefix="/api/v1/users",
     tags=["users"],
+    # ¿Qué? Clase de ruta que serializa los schemas retornados sin revalidarlos.
+    # ¿Para qué? Todos los endpoints de este router retornan schemas construidos por el
+    #            backend; ver routers/fast_route.py.
+    route_class=FastRoute,
 )
 
 
@@ -48,7 +53,7 @@ def get_current_user_profile(
     Returns:
         Datos del perfil del usuario (sin contraseña).
     """
-    return UserResponse.model_validate(current_user)
+    return UserResponse.from_user(current_user)
 
 
 @router.patch(
@@ -96,5 +101,5 @@ def update_locale(
     #            service → contiene la lógica de negocio.
     # ¿Impacto? Facilita testear la lógica de negocio sin levantar el servidor HTTP.
     updated_user = update_user_locale(db=db, user=current_user, locale=locale_data.locale)
-    return UserResponse.model_validate(updated_user)
+    return UserResponse.from_user(updated_user)
 
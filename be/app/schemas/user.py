@@ -12,13 +12,36 @@ Descripción: Schemas Pydantic para validación de datos de entrada (request) y
 import re
 import uuid
 from datetime import datetime
+from typing import TYPE_CHECKING, Annotated
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    ConfigDict,
+    EmailStr,
+    Field,
+    StringConstraints,
+    field_validator,
+)
+
+if TYPE_CHECKING:
+    from app.models.user import User
+
+
+# ¿Qué? Patrones de las reglas de composición de contraseña, compilados al importar.
+# ¿Para qué? re.search(r"...", v) busca el patrón en la caché interna del módulo `re` en
+#            cada llamada; con el objeto compilado se llama directo a su .search().
+# ¿Impacto? Se mantienen tres patrones separados (no un único lookahead) para conservar
+#           un mensaje de error específico por regla.
+_UPPER_RE = re.compile(r"[A-Z]")
+_LOWER_RE = re.compile(r"[a-z]")
+_DIGIT_RE = re.compile(r"\d")
 
 
 # ¿Qué? Función auxiliar con las reglas de fortaleza de contraseña.
 # ¿Para qué? Evitar duplicar el mismo bloque de validación en UserCreate,
-#           ChangePasswordRequest y ResetPasswordRequest (principio DRY).
+#           ChangePasswordRequest y ResetPasswordRequest (principio DRY) — se aplica
+#           a través del tipo StrongPassword definido abajo.
 # ¿Impacto? Si las reglas cambian (ej: exigir símbolo especial), solo se
 #           modifica este único lugar y todos los schemas quedan actualizados.
 def _validate_password_strength(v: str) -> str:
@@ -39,15 +62,76 @@ def _validate_password_strength(v: str) -> str:
     """
     if len(v) < 8:
         raise ValueError("La contraseña debe tener al menos 8 caracteres")
-    if not re.search(r"[A-Z]", v):
+    if not _UPPER_RE.search(v):
         raise ValueError("La contraseña debe contener al menos una letra mayúscula")
-    if not re.search(r"[a-z]", v):
+    if not _LOWER_RE.search(v):
         raise ValueError("La contraseña debe contener al menos una letra minúscula")
-    if not re.search(r"\d", v):
+    if not _DIGIT_RE.search(v):
         raise ValueError("La contraseña debe contener al menos un número")
     return v
 
 
+# ¿Qué? Tipo `str` con la validación de fortaleza adjunta (Annotated + AfterValidator).
+# ¿Para qué? Declarar `password: StrongPassword` en cada schema en lugar de repetir un
+#            @field_validator que solo delega en _validate_password_strength.
+# ¿Impacto? Pydantic construye el validador a partir de este único tipo: un solo callable
+#           compartido por UserCreate, ChangePasswordRequest y ResetPasswordRequest, y
+#           los mensajes de error (422) son exactamente los mismos que antes.
+StrongPassword = Annotated[str, AfterValidator(_validate_password_strength)]
+
+# ¿Qué? Tipo `str` al que pydantic-core le quita los espacios de los extremos.
+# ¿Para qué? Normalizar nombres sin un .strip() manual dentro del validador.
+# ¿Impacto? Se aplica por campo y no con str_strip_whitespace en el model_config: ese
+#           ajuste también recortaría las contraseñas, y " Clave123" dejaría de ser
+#           la contraseña que el usuario escribió.
+StrippedStr = Annotated[str, StringConstraints(strip_whitespace=True)]
+
+
+# ¿Qué? Forma mínima de un email (algo@dominio.tld), compilada al importar.
+# ¿Para qué? Validar los emails de login y forgot-password sin pasar por email-validator.
+# ¿Impacto? Es la misma expresión que el CHECK ck_users_email_format de la tabla users:
+#           todo email que pueda existir en la BD pasa esta validación. Se usa con
+#           fullmatch(): con match(), "$" también acepta un "\n" final.
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def _validate_lookup_email(v: str) -> str:
+    """Valida la forma de un email que solo se usa para buscar un usuario existente.
+
+    ¿Qué? Aplica _EMAIL_RE y pasa a minúsculas la parte del dominio.
+    ¿Para qué? Login y forgot-password no crean cuentas: solo buscan por email. La
+              validación completa (EmailStr) ya se hizo una vez, en el registro.
+    ¿Impacto? Evita el trabajo de email-validator en cada intento de login, incluidos los
+              de fuerza bruta. El dominio se normaliza igual que EmailStr para que
+              "Ana@Example.COM" siga encontrando a "Ana@example.com".
+
+    Args:
+        v: Email recibido en el request.
+
+    Returns:
+        El email con el dominio en minúsculas.
+
+    Raises:
+        ValueError: Si el valor no tiene la forma algo@dominio.tld.
+    """
+    if not _EMAIL_RE.fullmatch(v):
+        raise ValueError("El email no tiene un formato válido")
+    local, _, domain = v.rpartition("@")
+    return f"{local}@{domain.lower()}"
+
+
+# ¿Qué? Tipo `str` para emails de búsqueda (login, forgot-password).
+# ¿Para qué? Sustituir EmailStr donde el email no se va a guardar.
+# ¿Impacto? max_length=254 (límite de RFC 5321, el mismo que aplica EmailStr) corta
+#           entradas enormes antes de la regex; "format": "email" mantiene la misma
+#           documentación en Swagger/OpenAPI.
+LookupEmail = Annotated[
+    str,
+    Field(max_length=254, json_schema_extra={"format": "email"}),
+    AfterValidator(_validate_lookup_email),
+]
+
+
 # ════════════════════════════════════════
 # 📥 Schemas de REQUEST (datos que envía el cliente)
 # ════════════════════════════════════════
@@ -70,42 +154,32 @@ class UserCreate(BaseModel):
     # ¿Qué? Nombres del usuario (primer nombre, nombres de pila).
     # ¿Para qué? Personalización de la experiencia — el frontend usa first_name para saludar.
     # ¿Impacto? Campo requerido — sin nombre, no se puede personalizar la interfaz.
-    first_name: str
+    first_name: StrippedStr
 
     # ¿Qué? Apellidos del usuario.
     # ¿Para qué? Complementar la identidad del usuario junto con first_name.
     # ¿Impacto? Campo requerido — permite mostrar el nombre completo cuando sea necesario.
-    last_name: str
+    last_name: StrippedStr
 
     # ¿Qué? Contraseña en texto plano (solo viaja en el request, NUNCA se almacena así).
-    # ¿Para qué? El backend la hashea con bcrypt antes de guardarla en la BD.
-    # ¿Impacto? El validador exige mínimo 8 caracteres, 1 mayúscula, 1 minúscula, 1 número.
-    password: str
-
-    @field_validator("password")
-    @classmethod
-    def validate_password_strength(cls, v: str) -> str:
-        """Valida que la contraseña cumpla requisitos mínimos de seguridad.
-
-        ¿Qué? Delega en la función auxiliar _validate_password_strength.
-        ¿Para qué? Mantener el validador declarativo en el schema sin duplicar lógica.
-        ¿Impacto? Sin esta validación, un usuario podría registrarse con "a" como contraseña.
-        """
-        return _validate_password_strength(v)
+    # ¿Para qué? El backend la hashea con argon2id antes de guardarla en la BD.
+    # ¿Impacto? StrongPassword exige mínimo 8 caracteres, 1 mayúscula, 1 minúscula, 1 número.
+    #           Sin esta validación, un usuario podría registrarse con "a" como contraseña.
+    password: StrongPassword
 
     @field_validator("first_name", "last_name")
     @classmethod
     def validate_name_field(cls, v: str) -> str:
         """Valida y normaliza los campos de nombre.
 
-        ¿Qué? Aplica a first_name y last_name: strip de espacios, longitud mínima/máxima
-              y conversión a MAYÚSCULAS.
+        ¿Qué? Aplica a first_name y last_name (ya sin espacios en los extremos, por
+              StrippedStr): longitud mínima/máxima y conversión a MAYÚSCULAS.
         ¿Para qué? Garantizar consistencia en la BD — siempre se almacenan en uppercase,
                   sin importar cómo los ingrese el usuario (minúsculas, mixto, etc.).
         ¿Impacto? Sin la normalización, el mismo nombre "juan" y "Juan" y "JUAN" podrían
                   coexistir con formatos distintos, dificultando búsquedas y comparaciones.
         """
-        v = v.strip().upper()
+        v = v.upper()
         if len(v) < 2:
             raise ValueError("El campo debe tener al menos 2 caracteres")
         if len(v) > 255:
@@ -122,7 +196,11 @@ class UserLogin(BaseModel):
               se hace en el service, no aquí.
     """
 
-    email: EmailStr
+    # ¿Qué? Email de la cuenta, validado solo en su forma (LookupEmail, no EmailStr).
+    # ¿Para qué? El login es el endpoint más expuesto a fuerza bruta; aquí solo se busca.
+    # ¿Impacto? Un email mal formado sigue respondiendo 422; uno bien formado que no
+    #           existe responde 401, igual que antes.
+    email: LookupEmail
     password: str
 
 
@@ -137,21 +215,11 @@ class ChangePasswordRequest(BaseModel):
     """
 
     current_password: str
-    new_password: str
-
-    @field_validator("new_password")
-    @classmethod
-    def validate_new_password_strength(cls, v: str) -> str:
-        """Valida la fortaleza de la nueva contraseña en el cambio de contraseña.
-
-        ¿Qué? Delega en _validate_password_strength para verificar longitud y composición.
-        ¿Para qué? Garantizar que el usuario no debilite su cuenta al cambiarla —
-                   las mismas reglas del registro aplican aquí (≥8 chars, mayúscula,
-                   minúscula, número). Principio DRY: una sola función con las reglas.
-        ¿Impacto? Sin esta validación, un usuario podría cambiar su contraseña
-                  segura por una débil como "abc" sin que el sistema lo impida.
-        """
-        return _validate_password_strength(v)
+    # ¿Qué? Nueva contraseña, validada con las mismas reglas del registro (StrongPassword).
+    # ¿Para qué? Garantizar que el usuario no debilite su cuenta al cambiarla.
+    # ¿Impacto? Sin esta validación, un usuario podría cambiar su contraseña
+    #           segura por una débil como "abc" sin que el sistema lo impida.
+    new_password: StrongPassword
 
 
 class ForgotPasswordRequest(BaseModel):
@@ -163,7 +231,7 @@ class ForgotPasswordRequest(BaseModel):
               existe o no — esto previene la enumeración de usuarios.
     """
 
-    email: EmailStr
+    email: LookupEmail
 
 
 class ResetPasswordRequest(BaseModel):
@@ -179,21 +247,12 @@ class ResetPasswordRequest(BaseModel):
     # ¿Para qué? El backend lo busca en password_reset_tokens para validar y actualizar.
     # ¿Impacto? min_length=1 rechaza strings vacíos con 422 antes de consultar la BD.
     token: str = Field(min_length=1)
-    new_password: str
-
-    @field_validator("new_password")
-    @classmethod
-    def validate_new_password_strength(cls, v: str) -> str:
-        """Valida la fortaleza de la nueva contraseña en el restablecimiento.
-
-        ¿Qué? Delega en _validate_password_strength para verificar longitud y composición.
-        ¿Para qué? El flujo de reset-password no debe ser una vía para establecer
-                   contraseñas débiles — las mismas reglas del registro aplican aquí.
-                   Principio DRY: una sola función centraliza las reglas de fortaleza.
-        ¿Impacto? Sin esta validación, alguien que recobre acceso a su cuenta podría
-                  reemplazar su contraseña robusta por "123" — dejando la cuenta vulnerable.
-        """
-        return _validate_password_strength(v)
+    # ¿Qué? Nueva contraseña, validada con las mismas reglas del registro (StrongPassword).
+    # ¿Para qué? El flujo de reset-password no debe ser una vía para establecer
+    #            contraseñas débiles.
+    # ¿Impacto? Sin esta validación, alguien que recobre acceso a su cuenta podría
+    #           reemplazar su contraseña robusta por "123" — dejando la cuenta vulnerable.
+    new_password: StrongPassword
 
 
 class RefreshTokenRequest(BaseModel):
@@ -211,14 +270,14 @@ class RefreshTokenRequest(BaseModel):
 class VerifyEmailRequest(BaseModel):
     """Schema para verificar la dirección de email con el token enviado al usuario.
 
-    ¿Qué? Contiene el token UUID que el usuario recibió en su email de verificación.
+    ¿Qué? Contiene el token que el usuario recibió en su email de verificación.
     ¿Para qué? Confirmar que el email ingresado en el registro es real y accesible.
     ¿Impacto? Sin verificar el email, is_email_verified permanece False y el usuario
               no puede iniciar sesión. Este schema es lo que el frontend envía al
               endpoint POST /api/v1/auth/verify-email al recibir el token de la URL.
     """
 
-    # ¿Qué? Token UUID de verificación (viene como query param en la URL del email).
+    # ¿Qué? Token de verificación (viene como query param en la URL del email).
     # ¿Para qué? El backend lo busca en email_verification_tokens para validar y activar.
     # ¿Impacto? min_length=1 rechaza strings vacíos con 422 antes de consultar la BD.
     token: str = Field(min_length=1)
@@ -259,7 +318,31 @@ class UserResponse(BaseModel):
     # ¿Qué? Configuración que permite crear este schema desde un objeto SQLAlchemy.
     # ¿Para qué? Convertir User (ORM) → UserResponse (Pydantic) automáticamente.
     # ¿Impacto? Sin esto, habría que construir el dict manualmente campo por campo.
-    model_config = ConfigDict(from_attributes=True)
+    #           frozen=True: una respuesta ya construida no se modifica — asignar un campo
+    #           lanza ValidationError en lugar de alterar lo que se va a serializar.
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    @classmethod
+    def from_user(cls, user: "User") -> "UserResponse":
+        """Construye la respuesta a partir de un User del ORM sin revalidar sus campos.
+
+        ¿Qué? Copia los atributos listados en model_fields y usa model_construct(), que
+              no ejecuta validación ni coerción de tipos.
+        ¿Para qué? Los valores ya vienen tipados desde PostgreSQL vía SQLAlchemy (UUID,
+                  datetime, bool); validarlos otra vez con model_validate() es trabajo
+                  repetido en cada GET /me, PATCH /me/locale y POST /register.
+        ¿Impacto? Solo se copian los campos declarados en este schema: hashed_password
+                  nunca llega a la respuesta. No usar con datos que no vengan de la BD.
+
+        Args:
+            user: Usuario persistente (modelo ORM).
+
+        Returns:
+            UserResponse con los datos públicos del usuario.
+        """
+        return cls.model_construct(
+            **{name: getattr(user, name) for name in cls.model_fields}
+        )
 
 
 class TokenResponse(BaseModel):
@@ -271,10 +354,38 @@ class TokenResponse(BaseModel):
               header Authorization: Bearer <access_token>.
     """
 
+    # ¿Qué? Respuesta inmutable (frozen), igual que UserResponse y MessageResponse.
+    # ¿Para qué? Los schemas de respuesta se construyen una vez y solo se serializan.
+    # ¿Impacto? Cualquier intento de modificar un token ya emitido falla de inmediato.
+    model_config = ConfigDict(frozen=True)
+
     access_token: str
     refresh_token: str
     token_type: str = "bearer"
 
+    @classmethod
+    def from_tokens(cls, access_token: str, refresh_token: str) -> "TokenResponse":
+        """Construye la respuesta con un par de tokens recién firmados, sin revalidarlos.
+
+        ¿Qué? Usa model_construct(), igual que UserResponse.from_user(); token_type toma
+              su valor por defecto ("bearer").
+        ¿Para qué? Login y refresh son los endpoints más llamados después de GET /me y los
+                  tokens son strings que acaba de generar create_access_token /
+                  create_refresh_token: no hay nada que validar.
+        ¿Impacto? FastRoute serializa el modelo directo a JSON con pydantic-core; con esto
+                  la respuesta de login/refresh no pasa por ningún validador.
+
+        Args:
+            access_token: JWT de acceso.
+            refresh_token: JWT de refresco.
+
+        Returns:
+            TokenResponse listo para serializar.
+        """
+        return cls.model_construct(
+            access_token=access_token, refresh_token=refresh_token
+        )
+
 
 class MessageResponse(BaseModel):
     """Schema de respuesta genérico con un mensaje.
@@ -286,6 +397,8 @@ class MessageResponse(BaseModel):
               puede esperar un campo "message" en operaciones sin datos de retorno.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     message: str
 
 
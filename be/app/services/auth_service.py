@@ -10,15 +10,22 @@ Descripción: Lógica de negocio para todas las operaciones de autenticación 
 """
 
 import uuid
+from collections.abc import Callable
+from contextlib import AbstractContextManager
 from datetime import datetime, timedelta, timezone
+from functools import partial
 
-from fastapi import HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from anyio import to_thread
+from fastapi import BackgroundTasks, HTTPException, status
+from sqlalchemy import bindparam, delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, contains_eager, lazyload
 
+from app.database import SessionLocal
+from app.dependencies import cache_user_snapshot, get_cached_user_snapshot
 from app.models.email_verification_token import EmailVerificationToken
 from app.models.password_reset_token import PasswordResetToken
-from app.models.user import User
+from app.models.user import USER_BY_EMAIL, User
 from app.schemas.user import (
     ChangePasswordRequest,
     ResetPasswordRequest,
@@ -39,12 +46,74 @@ from app.utils.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
+    generate_reset_token,
+    generate_verification_token,
     hash_password,
-    verify_password,
+    hash_password_async,
+    hash_reset_token,
+    verify_and_update_password,
+    verify_password_async,
 )
 
 
-async def register_user(db: Session, user_data: UserCreate) -> User:
+# ¿Qué? SELECT de solo las columnas que necesita el login, por email (bindparam).
+# ¿Para qué? login_user no usa nombres, locale, fechas ni relaciones: con estas cinco
+#            columnas decide si las credenciales son válidas y emite los tokens.
+# ¿Impacto? Viajan menos bytes desde PostgreSQL y se obtiene una Row liviana en lugar de
+#           una instancia ORM registrada en el identity map. Se construye una sola vez, así
+#           que su SQL compilado queda en la caché de sentencias del engine.
+_LOGIN_ROW_BY_EMAIL = select(
+    User.id,
+    User.email,
+    User.hashed_password,
+    User.is_active,
+    User.is_email_verified,
+).where(User.email == bindparam("email"))
+
+
+# ¿Qué? INSERT de usuario que no hace nada si el email ya existe y retorna la fila creada.
+# ¿Para qué? register_user le agrega los valores con .values(); la cláusula ON CONFLICT
+#            y el RETURNING de la entidad completa se construyen una sola vez.
+# ¿Impacto? Un email duplicado no levanta IntegrityError: el resultado viene vacío.
+#           lazyload evita las dos consultas selectin de las colecciones de tokens, que
+#           para un usuario recién creado siempre están vacías.
+_INSERT_USER = (
+    pg_insert(User)
+    .on_conflict_do_nothing(index_elements=[User.email])
+    .returning(User)
+    .options(
+        lazyload(User.password_reset_tokens),
+        lazyload(User.email_verification_tokens),
+    )
+)
+
+# ¿Qué? SELECT solo del id del usuario con un email dado.
+# ¿Para qué? register_user solo necesita saber si el email ya existe; cargar el User
+#            completo también dispararía las consultas selectin de sus relaciones.
+_USER_ID_BY_EMAIL = select(User.id).where(User.email == bindparam("email"))
+
+
+# ¿Qué? SELECT del token de reset (por hash) junto con su usuario, en un solo JOIN.
+# ¿Para qué? reset_password necesita ambos; contains_eager llena token.user con las
+#            columnas del JOIN y lazyload evita que las colecciones selectin del usuario
+#            (sus tokens de reset y de verificación) disparen consultas que no se usan.
+# ¿Impacto? Un único round-trip en lugar de tres SELECT encadenados.
+_RESET_TOKEN_WITH_USER = (
+    select(PasswordResetToken)
+    .join(PasswordResetToken.user)
+    .where(PasswordResetToken.token_hash == bindparam("token_hash"))
+    .options(
+        contains_eager(PasswordResetToken.user).options(
+            lazyload(User.password_reset_tokens),
+            lazyload(User.email_verification_tokens),
+        )
+    )
+)
+
+
+async def register_user(
+    db: Session, user_data: UserCreate, background_tasks: BackgroundTasks
+) -> User:
     """Registra un nuevo usuario y envía el email de verificación de cuenta.
 
     ¿Qué? Crea una nueva cuenta con email, nombre y contraseña hasheada,
@@ -58,6 +127,7 @@ async def register_user(db: Session, user_data: UserCreate) -> User:
     Args:
         db: Sesión de base de datos.
         user_data: Datos validados del usuario (email, full_name, password).
+        background_tasks: Tareas que FastAPI ejecuta después de enviar la respuesta.
 
     Returns:
         Objeto User creado y persistido en la BD.
@@ -68,10 +138,17 @@ async def register_user(db: Session, user_data: UserCreate) -> User:
     # ¿Qué? Buscar si ya existe un usuario con ese email.
     # ¿Para qué? Evitar cuentas duplicadas — email es UNIQUE en la BD.
     # ¿Impacto? Sin esta verificación, la BD lanzaría un IntegrityError poco descriptivo.
-    stmt = select(User).where(User.email == user_data.email)
-    existing_user = db.execute(stmt).scalar_one_or_none()
+    # ¿Qué? La consulta corre en el threadpool (to_thread), como todo el I/O de BD de esta
+    #       función async.
+    # ¿Para qué? Una consulta síncrona llamada desde una corrutina bloquea el event loop
+    #            mientras espera a PostgreSQL: el resto de requests del worker se detienen.
+    existing_user_id = await to_thread.run_sync(
+        lambda: db.execute(
+            _USER_ID_BY_EMAIL, {"email": user_data.email}
+        ).scalar_one_or_none()
+    )
 
-    if existing_user:
+    if existing_user_id is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="El email ya está registrado",
@@ -79,23 +156,40 @@ async def register_user(db: Session, user_data: UserCreate) -> User:
 
     # ¿Qué? Crear el objeto User con la contraseña hasheada.
     # ¿Para qué? Almacenar la contraseña de forma segura — NUNCA en texto plano.
-    # ¿Impacto? hash_password usa bcrypt, que es deliberadamente lento para dificultar
-    #           ataques de fuerza bruta contra hashes filtrados.
-    new_user = User(
-        email=user_data.email,
-        first_name=user_data.first_name,
-        last_name=user_data.last_name,
-        hashed_password=hash_password(user_data.password),
+    # ¿Impacto? argon2id es deliberadamente lento para dificultar ataques de fuerza bruta
+    #           contra hashes filtrados — por eso, en esta función async, se ejecuta en el
+    #           threadpool (hash_password_async) en lugar de bloquear el event loop.
+    hashed_password = await hash_password_async(user_data.password)
+
+    # ¿Qué? INSERT ... ON CONFLICT (email) DO NOTHING RETURNING de todas las columnas.
+    # ¿Para qué? Dos registros simultáneos con el mismo email pueden pasar ambos la
+    #            verificación de arriba; con ON CONFLICT el segundo no inserta nada y recibe
+    #            el mismo 400 en vez de un IntegrityError (500). RETURNING trae id, defaults
+    #            y fechas generadas por PostgreSQL en el mismo viaje.
+    # ¿Impacto? Ya no hace falta db.refresh() tras el commit (un SELECT más, y otros dos
+    #           por las relaciones selectin). La SELECT previa se mantiene: evita gastar un
+    #           hash argon2id en cada intento con un email ya registrado.
+    new_user = await to_thread.run_sync(
+        lambda: db.scalars(
+            _INSERT_USER.values(
+                email=user_data.email,
+                first_name=user_data.first_name,
+                last_name=user_data.last_name,
+                hashed_password=hashed_password,
+            )
+        ).one_or_none()
     )
 
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    if new_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El email ya está registrado",
+        )
 
-    # ¿Qué? Genera un token UUID único para el enlace de verificación de email.
+    # ¿Qué? Genera un token aleatorio único para el enlace de verificación de email.
     # ¿Para qué? Este token viaja en la URL del email y confirma la posesión del buzón.
-    # ¿Impacto? UUID4 tiene 122 bits de entropía — prácticamente imposible de adivinar.
-    verification_token = str(uuid.uuid4())
+    # ¿Impacto? 128 bits de entropía (secrets) — prácticamente imposible de adivinar.
+    verification_token = generate_verification_token()
 
     # ¿Qué? Crea el registro del token en la tabla email_verification_tokens.
     # ¿Para qué? Almacenar el token con su expiración para validarlo cuando el usuario haga clic.
@@ -106,13 +200,24 @@ async def register_user(db: Session, user_data: UserCreate) -> User:
         expires_at=datetime.now(timezone.utc) + timedelta(hours=24),
     )
     db.add(token_record)
-    db.commit()
+
+    # ¿Qué? Separar al usuario de la sesión antes del commit.
+    # ¿Para qué? El commit expira las instancias de la sesión y leer cualquier atributo
+    #            después dispararía un SELECT (el db.refresh que RETURNING hizo innecesario).
+    # ¿Impacto? Usuario y token se confirman en una sola transacción; el User retornado
+    #           conserva los valores de RETURNING para construir la respuesta.
+    db.expunge(new_user)
+    await to_thread.run_sync(db.commit)
 
     # ¿Qué? Envía el email de verificación al usuario recién registrado.
     # ¿Para qué? El usuario debe hacer clic en el enlace para activar su cuenta.
     # ¿Impacto? Si RESEND_API_KEY no está configurada, el enlace se imprime en los logs.
     #           El fallo de envío NO revierte el registro — el error es no bloqueante.
-    await send_verification_email(email=new_user.email, token=verification_token)
+    #           Se encola como tarea en segundo plano: la respuesta 201 sale apenas se
+    #           confirma el commit, sin esperar la latencia de Resend/SMTP.
+    background_tasks.add_task(
+        send_verification_email, email=new_user.email, token=verification_token
+    )
 
     return new_user
 
@@ -140,16 +245,18 @@ def login_user(db: Session, login_data: UserLogin) -> TokenResponse:
     # ¿Para qué? Obtener el hash almacenado para comparar con la contraseña ingresada.
     # ¿Impacto? Si el usuario no existe, se retorna el MISMO error que si la contraseña
     #           es incorrecta — esto previene la enumeración de emails.
-    stmt = select(User).where(User.email == login_data.email)
-    user = db.execute(stmt).scalar_one_or_none()
+    user = db.execute(_LOGIN_ROW_BY_EMAIL, {"email": login_data.email}).one_or_none()
 
-    # ¿Qué? Si el usuario no existe, igual se corre bcrypt contra DUMMY_PASSWORD_HASH.
+    # ¿Qué? Si el usuario no existe, igual se verifica contra DUMMY_PASSWORD_HASH.
     # ¿Para qué? Sin esto, el branch "usuario no existe" retorna en microsegundos
-    #           mientras que "contraseña incorrecta" tarda lo que tarda bcrypt (~60-100ms) —
-    #           esa diferencia de tiempo delata qué emails existen aunque el mensaje
+    #           mientras que "contraseña incorrecta" tarda lo que tarda el hashing (decenas
+    #           de ms) — esa diferencia de tiempo delata qué emails existen aunque el mensaje
     #           de error sea idéntico (timing attack, OWASP A07).
     password_hash = user.hashed_password if user else DUMMY_PASSWORD_HASH
-    if not user or not verify_password(login_data.password, password_hash):
+    password_ok, upgraded_hash = verify_and_update_password(
+        login_data.password, password_hash
+    )
+    if not user or not password_ok:
         # ¿Qué? Registrar el intento fallido antes de lanzar la excepción.
         # ¿Para qué? Detectar patrones de fuerza bruta — múltiples fallos en poco tiempo son alarma.
         # ¿Impacto? OWASP A09: sin este log, un ataque de 10,000 intentos pasa desapercibido.
@@ -184,11 +291,28 @@ def login_user(db: Session, login_data: UserLogin) -> TokenResponse:
             ),
         )
 
+    # ¿Qué? Re-hashear la contraseña si su hash usa un esquema obsoleto (bcrypt → argon2id).
+    # ¿Para qué? Migrar los hashes existentes sin pedir a los usuarios que cambien su
+    #            contraseña: el login es el único momento en que se conoce en claro.
+    # ¿Impacto? Ocurre una sola vez por usuario; los logins siguientes ya usan argon2id.
+    #           Va después de las comprobaciones de 403: una cuenta desactivada o sin
+    #           verificar no provoca escrituras en la BD aunque acierte la contraseña.
+    #           La fila de login no es una entidad ORM: se carga el User por clave primaria
+    #           para que el UPDATE pase por la unidad de trabajo (updated_at, eventos que
+    #           invalidan la caché de usuarios).
+    if upgraded_hash is not None:
+        db_user = db.get(User, user.id)
+        if db_user is not None:
+            db_user.hashed_password = upgraded_hash
+            db.commit()
+
     # ¿Qué? Generar par de tokens JWT (access + refresh).
     # ¿Para qué? El access token se usa en cada request; el refresh token para renovar.
     # ¿Impacto? "sub" (subject) contiene el email — es lo que identifica al usuario en el token.
+    #           El refresh token lleva además "uid" (id del usuario) para que
+    #           refresh_access_token pueda resolverlo desde la caché de usuarios.
     access_token = create_access_token(data={"sub": user.email})
-    refresh_token = create_refresh_token(data={"sub": user.email})
+    refresh_token = create_refresh_token(data={"sub": user.email, "uid": str(user.id)})
 
     # ¿Qué? Registrar el login exitoso para auditoría.
     # ¿Para qué? Los logins exitosos también son relevantes — permiten detectar accesos
@@ -197,10 +321,7 @@ def login_user(db: Session, login_data: UserLogin) -> TokenResponse:
     #            que usaron credenciales robadas.
     log_login_success(email=user.email)
 
-    return TokenResponse(
-        access_token=access_token,
-        refresh_token=refresh_token,
-    )
+    return TokenResponse.from_tokens(access_token, refresh_token)
 
 
 def refresh_access_token(db: Session, refresh_token: str) -> TokenResponse:
@@ -221,12 +342,11 @@ def refresh_access_token(db: Session, refresh_token: str) -> TokenResponse:
     Raises:
         HTTPException 401: Si el refresh token es inválido o expirado.
     """
-    payload = decode_token(refresh_token)
-
     # ¿Qué? Verificar que el token es válido y de tipo "refresh".
     # ¿Para qué? Evitar que un access token sea usado como refresh token.
     # ¿Impacto? Sin esta verificación, la distinción entre tipos de token sería inútil.
-    if not payload or payload.get("type") != "refresh":
+    payload = decode_token(refresh_token, expected_type="refresh")
+    if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Refresh token inválido o expirado",
@@ -240,14 +360,26 @@ def refresh_access_token(db: Session, refresh_token: str) -> TokenResponse:
             detail="Token sin identificador de usuario",
         )
 
-    # ¿Qué? Verificar que el usuario aún existe y está activo.
-    # ¿Para qué? Si la cuenta fue eliminada o desactivada después del login,
-    #            no debería poder renovar su sesión.
-    # ¿Impacto? Sin esto, usuarios eliminados mantendrían acceso hasta que expire el refresh.
-    stmt = select(User).where(User.email == email)
-    user = db.execute(stmt).scalar_one_or_none()
-
-    if not user or not user.is_active:
+    # ¿Qué? Resolver el usuario desde la caché de usuarios cuando el token trae "uid".
+    # ¿Para qué? El refresh solo necesita saber si la cuenta sigue existiendo y activa; si
+    #            get_current_user o un refresh anterior ya cargaron al usuario, no hace
+    #            falta el SELECT por email.
+    # ¿Impacto? El snapshot se invalida con cada UPDATE/DELETE de User en este worker, así
+    #           que desactivar la cuenta o cambiar la contraseña se ve en el siguiente
+    #           refresh; en otros workers, tras USER_CACHE_TTL_SECONDS como máximo.
+    #           Los refresh tokens emitidos antes de agregar "uid" usan la consulta normal.
+    user_id: str | None = payload.get("uid")
+    snapshot = get_cached_user_snapshot(uuid.UUID(user_id)) if user_id else None
+
+    if snapshot is None or snapshot["email"] != email:
+        # ¿Qué? Verificar que el usuario aún existe y está activo.
+        # ¿Para qué? Si la cuenta fue eliminada o desactivada después del login,
+        #            no debería poder renovar su sesión.
+        # ¿Impacto? Sin esto, usuarios eliminados mantendrían acceso hasta que expire el refresh.
+        user = db.execute(USER_BY_EMAIL, {"email": email}).scalar_one_or_none()
+        snapshot = cache_user_snapshot(user) if user else None
+
+    if snapshot is None or not snapshot["is_active"]:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuario no encontrado o cuenta desactivada",
@@ -257,16 +389,15 @@ def refresh_access_token(db: Session, refresh_token: str) -> TokenResponse:
     # ¿Para qué? Si el refresh token anterior fue comprometido, el nuevo lo invalida
     #            (el antiguo ya no se puede usar porque se regenera).
     # ¿Impacto? Mejora la seguridad: cada refresh genera un nuevo par de tokens.
-    new_access = create_access_token(data={"sub": user.email})
-    new_refresh = create_refresh_token(data={"sub": user.email})
+    new_access = create_access_token(data={"sub": email})
+    new_refresh = create_refresh_token(data={"sub": email, "uid": str(snapshot["id"])})
 
-    return TokenResponse(
-        access_token=new_access,
-        refresh_token=new_refresh,
-    )
+    return TokenResponse.from_tokens(new_access, new_refresh)
 
 
-def change_password(db: Session, user: User, password_data: ChangePasswordRequest) -> None:
+async def change_password(
+    db: Session, user: User, password_data: ChangePasswordRequest
+) -> None:
     """Cambia la contraseña de un usuario autenticado.
 
     ¿Qué? Verifica la contraseña actual y actualiza con la nueva (hasheada).
@@ -282,22 +413,48 @@ def change_password(db: Session, user: User, password_data: ChangePasswordReques
     Raises:
         HTTPException 400: Si la contraseña actual es incorrecta.
     """
-    # ¿Qué? Verificar que el usuario conoce su contraseña actual.
+    # ¿Qué? Releer la fila del usuario desde la BD (populate_existing sobrescribe la instancia).
+    # ¿Para qué? get_current_user puede haber resuelto al usuario desde la caché de snapshots;
+    #            la contraseña actual debe verificarse contra el hash VIGENTE, no contra uno
+    #            que otro worker ya reemplazó, y una cuenta desactivada no puede cambiarla.
+    # ¿Impacto? Un SELECT por clave primaria extra en un flujo poco frecuente.
+    user = await to_thread.run_sync(
+        partial(db.get, User, user.id, populate_existing=True)
+    )
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No se pudieron validar las credenciales",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Cuenta desactivada",
+        )
+
+    # ¿Qué? Rechazar el cambio si el usuario no conoce su contraseña actual.
     # ¿Para qué? Capa de seguridad adicional — si alguien tiene el token pero no la contraseña,
     #            no puede cambiarla.
     # ¿Impacto? Sin esta verificación, cualquiera con un access token válido podría
-    #           cambiar la contraseña y apoderarse de la cuenta.
-    if not verify_password(password_data.current_password, user.hashed_password):
+    #           cambiar la contraseña y apoderarse de la cuenta. La nueva contraseña solo
+    #           se hashea después de verificar la actual: un intento fallido cuesta un
+    #           único cálculo de argon2id y ocupa un solo turno de _PASSWORD_HASH_SLOTS.
+    if not await verify_password_async(
+        password_data.current_password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="La contraseña actual es incorrecta",
         )
+    new_hash = await hash_password_async(password_data.new_password)
 
-    # ¿Qué? Hashear la nueva contraseña y actualizar en la BD.
+    # ¿Qué? Guardar el nuevo hash en la BD.
     # ¿Para qué? Almacenar la nueva contraseña de forma segura.
     # ¿Impacto? Después de este cambio, la contraseña anterior ya no funciona para login.
-    user.hashed_password = hash_password(password_data.new_password)
-    db.commit()
+    #           El commit es I/O síncrono: corre en el threadpool para no bloquear el loop.
+    user.hashed_password = new_hash
+    await to_thread.run_sync(db.commit)
 
     # ¿Qué? Registrar el cambio de contraseña para auditoría.
     # ¿Para qué? Si el usuario legítimo recibe una notificación de cambio que no reconoce,
@@ -306,45 +463,78 @@ def change_password(db: Session, user: User, password_data: ChangePasswordReques
     log_password_changed(user_id=str(user.id))
 
 
-async def request_password_reset(db: Session, email: str) -> None:
+def _create_password_reset_token(
+    session_factory: Callable[[], AbstractContextManager[Session]], email: str
+) -> tuple[str, str] | None:
+    """Busca al usuario por email y, si existe, guarda un token de reset nuevo.
+
+    ¿Qué? Parte síncrona (BD) de request_password_reset, con su propia sesión.
+    ¿Para qué? Ejecutarse en el threadpool: las consultas de SQLAlchemy son bloqueantes y
+              no deben correr en el event loop.
+    ¿Impacto? La sesión se abre y se cierra aquí mismo — la del request (get_db) ya no
+              existe cuando corre la tarea en segundo plano.
+
+    Args:
+        session_factory: Fábrica de sesiones (SessionLocal o la de testing).
+        email: Email del usuario que solicita la recuperación.
+
+    Returns:
+        Tupla (email del usuario, token en claro), o None si el email no está registrado.
+    """
+    with session_factory() as db:
+        user = db.execute(USER_BY_EMAIL, {"email": email}).scalar_one_or_none()
+
+        # ¿Qué? Si el usuario no existe, retornar silenciosamente sin hacer nada.
+        # ¿Para qué? Prevenir enumeración de usuarios — la API no debe revelar si el email existe.
+        # ¿Impacto? El cliente ya recibió "Si el email existe, recibirás un enlace..."
+        #           antes de que esta búsqueda se ejecute.
+        if not user:
+            return None
+
+        # ¿Qué? Generar un token aleatorio para el enlace de recuperación y su hash SHA-256.
+        # ¿Para qué? El token en claro viaja en la URL del email; en la BD solo queda el hash.
+        # ¿Impacto? 256 bits de entropía — imposible de adivinar. Una filtración de la BD no
+        #           expone tokens utilizables.
+        reset_token, reset_token_hash = generate_reset_token()
+
+        # ¿Qué? Crear el registro del token en la tabla password_reset_tokens.
+        # ¿Para qué? Almacenar el hash del token con su expiración para validarlo después.
+        # ¿Impacto? Expiración de 1 hora — después de eso, el usuario debe solicitar otro.
+        token_record = PasswordResetToken(
+            user_id=user.id,
+            token_hash=reset_token_hash,
+            expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+        )
+
+        user_email = user.email
+        db.add(token_record)
+        db.commit()
+
+    return user_email, reset_token
+
+
+async def request_password_reset(
+    email: str,
+    session_factory: Callable[[], AbstractContextManager[Session]] = SessionLocal,
+) -> None:
     """Solicita un email de recuperación de contraseña.
 
     ¿Qué? Genera un token de reset, lo guarda en la BD y envía el email con el enlace.
     ¿Para qué? Permitir al usuario restablecer su contraseña cuando la ha olvidado.
-    ¿Impacto? SIEMPRE retorna éxito, incluso si el email no existe en la BD.
-              Esto previene la enumeración de usuarios (un atacante no puede saber
-              si un email está registrado basándose en la respuesta).
+    ¿Impacto? Se ejecuta como tarea en segundo plano (BackgroundTasks), DESPUÉS de enviar
+              la respuesta: el endpoint responde lo mismo y en el mismo tiempo exista o no
+              el email, así que ni el mensaje ni la latencia permiten enumerar usuarios.
 
     Args:
-        db: Sesión de base de datos.
         email: Email del usuario que solicita la recuperación.
+        session_factory: Fábrica de sesiones; por defecto SessionLocal.
     """
-    stmt = select(User).where(User.email == email)
-    user = db.execute(stmt).scalar_one_or_none()
-
-    # ¿Qué? Si el usuario no existe, retornar silenciosamente sin hacer nada.
-    # ¿Para qué? Prevenir enumeración de usuarios — la API no debe revelar si el email existe.
-    # ¿Impacto? El cliente siempre ve "Si el email existe, recibirás un enlace..."
-    #           Sin importar si el email está registrado o no.
-    if not user:
-        return
-
-    # ¿Qué? Generar un token UUID único para el enlace de recuperación.
-    # ¿Para qué? Este token viaja en la URL del email y se valida al restablecer.
-    # ¿Impacto? UUID4 tiene 122 bits de entropía — prácticamente imposible de adivinar.
-    reset_token = str(uuid.uuid4())
-
-    # ¿Qué? Crear el registro del token en la tabla password_reset_tokens.
-    # ¿Para qué? Almacenar el token con su expiración para validarlo después.
-    # ¿Impacto? Expiración de 1 hora — después de eso, el usuario debe solicitar otro.
-    token_record = PasswordResetToken(
-        user_id=user.id,
-        token=reset_token,
-        expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+    result = await to_thread.run_sync(
+        _create_password_reset_token, session_factory, email
     )
-
-    db.add(token_record)
-    db.commit()
+    if result is None:
+        return
+    user_email, reset_token = result
 
     # ¿Qué? Registrar la solicitud de recuperación para auditoría.
     # ¿Para qué? Detectar abuso del endpoint — muchas solicitudes desde la misma IP
@@ -357,7 +547,7 @@ async def request_password_reset(db: Session, email: str) -> None:
     # ¿Qué? Enviar el email con el enlace de recuperación.
     # ¿Para qué? El usuario hace clic en el enlace, que lo lleva al frontend con el token.
     # ¿Impacto? En desarrollo, el enlace se imprime en la consola del servidor.
-    await send_password_reset_email(email=user.email, token=reset_token)
+    await send_password_reset_email(email=user_email, token=reset_token)
 
 
 def reset_password(db: Session, reset_data: ResetPasswordRequest) -> None:
@@ -375,13 +565,16 @@ def reset_password(db: Session, reset_data: ResetPasswordRequest) -> None:
     Raises:
         HTTPException 400: Si el token es inválido, expirado o ya fue usado.
     """
-    # ¿Qué? Buscar el token en la BD.
-    # ¿Para qué? Verificar que el token existe y obtener el usuario asociado.
+    # ¿Qué? Buscar el token por su hash SHA-256 y, en la MISMA consulta, su usuario (JOIN).
+    # ¿Para qué? Verificar que el token existe y obtener el usuario asociado en un solo
+    #            viaje a la BD.
     # ¿Impacto? Si el token no existe, alguien intentó usar un token falso o manipulado.
-    stmt = select(PasswordResetToken).where(
-        PasswordResetToken.token == reset_data.token
-    )
-    token_record = db.execute(stmt).scalar_one_or_none()
+    #           En la BD solo hay hashes, así que se hashea el token recibido para compararlo.
+    #           Sin las opciones, el lazy="selectin" de las relaciones emitiría un SELECT
+    #           extra por el usuario y otro por sus tokens de verificación.
+    token_record = db.execute(
+        _RESET_TOKEN_WITH_USER, {"token_hash": hash_reset_token(reset_data.token)}
+    ).scalar_one_or_none()
 
     if not token_record:
         raise HTTPException(
@@ -407,26 +600,49 @@ def reset_password(db: Session, reset_data: ResetPasswordRequest) -> None:
             detail="El token de recuperación ha expirado. Solicite uno nuevo.",
         )
 
-    # ¿Qué? Obtener el usuario asociado al token.
-    # ¿Para qué? Actualizar la contraseña del usuario correcto.
-    # ¿Impacto? El user_id del token apunta al usuario que solicitó la recuperación.
-    stmt = select(User).where(User.id == token_record.user_id)
-    user = db.execute(stmt).scalar_one_or_none()
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Usuario no encontrado",
-        )
-
     # ¿Qué? Actualizar la contraseña y marcar el token como usado.
     # ¿Para qué? Completar el reset + invalidar el token para que no se reutilice.
     # ¿Impacto? Después de esto, la contraseña anterior ya no funciona y el token es inválido.
-    user.hashed_password = hash_password(reset_data.new_password)
+    token_record.user.hashed_password = hash_password(reset_data.new_password)
     token_record.used = True
     db.commit()
 
 
+def purge_expired_reset_tokens(db: Session) -> int:
+    """Elimina de la BD los tokens de recuperación de contraseña expirados o ya usados.
+
+    ¿Qué? Ejecuta un único DELETE ... WHERE used OR expires_at < now() sobre
+          password_reset_tokens.
+    ¿Para qué? Cada solicitud de "olvidé mi contraseña" crea una fila que caduca en 1 hora
+              y deja de servir en cuanto se usa; sin limpieza, la tabla y su índice crecen
+              sin límite. La llama periódicamente la tarea del lifespan (main.py) cada
+              RESET_TOKEN_PURGE_INTERVAL_SECONDS; también sirve desde un cron externo.
+    ¿Impacto? Un solo statement en lugar de "SELECT + bucle + DELETE por fila": un viaje de
+              red a la BD sin importar cuántos tokens se borren. now() se evalúa en
+              PostgreSQL, así que no depende del reloj del servidor de la app.
+              synchronize_session=False evita que el ORM agregue RETURNING id para
+              sincronizar la sesión (no puede evaluar now() en Python): ningún id borrado
+              vuelve a la app, y esta sesión no tiene tokens cargados que sincronizar.
+              Un enlace ya purgado responde "Token de recuperación inválido" en lugar de
+              "ya fue utilizado"/"ha expirado": en ambos casos el enlace no sirve.
+
+    Args:
+        db: Sesión de base de datos.
+
+    Returns:
+        Número de tokens eliminados.
+    """
+    stmt = delete(PasswordResetToken).where(
+        or_(
+            PasswordResetToken.used.is_(True),
+            PasswordResetToken.expires_at < func.now(),
+        )
+    )
+    result = db.execute(stmt, execution_options={"synchronize_session": False})
+    db.commit()
+    return result.rowcount
+
+
 def verify_email(db: Session, token: str) -> None:
     """Verifica la dirección de email del usuario usando el token enviado al registrarse.
 
@@ -437,7 +653,7 @@ def verify_email(db: Session, token: str) -> None:
 
     Args:
         db: Sesión de base de datos.
-        token: UUID de verificación recibido por email.
+        token: Token de verificación (`secrets.token_urlsafe(16)`) recibido por email.
 
     Raises:
         HTTPException 400: Si el token no existe, ya fue usado o ha expirado.
@@ -478,8 +694,9 @@ def verify_email(db: Session, token: str) -> None:
     # ¿Para qué? Activar la cuenta para que el usuario pueda iniciar sesión.
     # ¿Impacto? is_email_verified=True desbloquea el login para este usuario.
     #           El token se marca como usado para que el enlace no pueda reutilizarse.
-    stmt_user = select(User).where(User.id == token_record.user_id)
-    user = db.execute(stmt_user).scalar_one_or_none()
+    #           db.get() resuelve por clave primaria desde el identity map (el usuario ya
+    #           se cargó junto al token vía lazy="selectin") sin un SELECT adicional.
+    user = db.get(User, token_record.user_id)
 
     if not user:
         raise HTTPException(
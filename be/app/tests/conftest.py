@@ -9,23 +9,50 @@ Descripción: Fixtures compartidos para todos los tests del backend.
           que los tests NUNCA afecten la BD de desarrollo/producción.
 """
 
-import uuid
-from collections.abc import Generator
+import os
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager, nullcontext
 from datetime import datetime, timedelta, timezone
 
+# ¿Qué? Costo mínimo de argon2id para la sesión de tests (8 KiB, 1 iteración, 1 hilo).
+# ¿Para qué? Los tests verifican el FLUJO (hash → verificar → re-hash), no la resistencia
+#            del hash; con el costo de producción cada registro, login y cambio de
+#            contraseña gasta decenas de ms y 19 MiB de RAM.
+# ¿Impacto? Debe fijarse ANTES de importar app.config: `settings` y el hasher argon2 de
+#           security.py se construyen al importar. setdefault respeta valores ya
+#           exportados (ej: para correr los tests con el costo real).
+os.environ.setdefault("PASSWORD_HASH_MEMORY_COST", "8")
+os.environ.setdefault("PASSWORD_HASH_TIME_COST", "1")
+os.environ.setdefault("PASSWORD_HASH_PARALLELISM", "1")
+
+# ¿Qué? Algoritmo JWT de la sesión de tests: HS256 (HMAC), el mismo que el default de la app.
+# ¿Para qué? Que un ALGORITHM distinto en el .env local no cambie lo que firman y verifican
+#            los tests; con HMAC la clave se precalcula una vez y firmar cuesta microsegundos.
+# ¿Impacto? El rechazo de tokens con otro "alg" (ej: "none") se prueba explícitamente en
+#           TestGetMe, así que fijar el algoritmo no oculta la confusión de algoritmos.
+os.environ.setdefault("ALGORITHM", "HS256")
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.config import settings
 from app.database import Base
-from app.dependencies import get_db
+from app.dependencies import _TOKEN_CACHE, _USER_CACHE, get_db, get_session_factory
 from app.main import app
-from app.models.password_reset_token import PasswordResetToken
 from app.models.email_verification_token import EmailVerificationToken
+from app.models.password_reset_token import PasswordResetToken
 from app.models.user import User
-from app.utils.security import create_access_token, hash_password
+from app.services import auth_service
+from app.utils.security import (
+    create_access_token,
+    create_refresh_token,
+    generate_reset_token,
+    generate_verification_token,
+    hash_password,
+)
 
 # ────────────────────────────
 # 🗄️ Configuración de BD de testing
@@ -41,7 +68,25 @@ TEST_DATABASE_URL = settings.DATABASE_URL
 # ¿Qué? Engine de SQLAlchemy exclusivo para tests.
 # ¿Para qué? Crear conexiones independientes a la BD de testing.
 # ¿Impacto? Separar el engine de testing del de la app evita interferencias.
-test_engine = create_engine(TEST_DATABASE_URL, pool_pre_ping=True)
+#           StaticPool mantiene UNA sola conexión DBAPI para toda la sesión de pytest:
+#           los tests corren en serie y cada uno usa una única conexión envuelta en una
+#           transacción que se revierte, así que no hace falta un pool ni el SELECT 1
+#           de pool_pre_ping en cada checkout.
+#
+# ¿Qué? Con pytest-xdist (`pytest -n N`), cada worker usa su propio esquema (test_gw0, ...).
+# ¿Para qué? Todos los workers comparten TEST_DATABASE_URL y setup_database hace
+#            drop_all/create_all: sobre el mismo esquema, un worker borraría las tablas
+#            de otro a mitad de la sesión.
+# ¿Impacto? search_path se fija al conectar, así que modelos y SQL en texto usan el esquema
+#           del worker sin cambios. Sin xdist (PYTEST_XDIST_WORKER ausente) todo queda
+#           igual: esquema por defecto (public).
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+TEST_SCHEMA = f"test_{_XDIST_WORKER}" if _XDIST_WORKER else None
+test_engine = create_engine(
+    TEST_DATABASE_URL,
+    poolclass=StaticPool,
+    connect_args={"options": f"-csearch_path={TEST_SCHEMA}"} if TEST_SCHEMA else {},
+)
 
 # ¿Qué? Fábrica de sesiones para tests.
 # ¿Para qué? Cada test obtiene una sesión de BD limpia y aislada.
@@ -67,10 +112,17 @@ def setup_database() -> Generator[None, None, None]:
     ¿Impacto? scope="session" significa que las tablas se crean una sola vez (eficiente),
               no por cada test individual.
     """
+    if TEST_SCHEMA:
+        with test_engine.begin() as connection:
+            connection.execute(text(f'DROP SCHEMA IF EXISTS "{TEST_SCHEMA}" CASCADE'))
+            connection.execute(text(f'CREATE SCHEMA "{TEST_SCHEMA}"'))
     Base.metadata.drop_all(bind=test_engine)
     Base.metadata.create_all(bind=test_engine)
     yield
     Base.metadata.drop_all(bind=test_engine)
+    if TEST_SCHEMA:
+        with test_engine.begin() as connection:
+            connection.execute(text(f'DROP SCHEMA IF EXISTS "{TEST_SCHEMA}" CASCADE'))
 
 
 @pytest.fixture()
@@ -85,21 +137,18 @@ def db() -> Generator[Session, None, None]:
     """
     connection = test_engine.connect()
     transaction = connection.begin()
-    session = TestSessionLocal(bind=connection)
 
-    # ¿Qué? Configurar el savepoint para nested transactions.
-    # ¿Para qué? Si el código de la app hace commit, el savepoint permite
-    #            revertir igualmente al final del test.
+    # ¿Qué? join_transaction_mode="create_savepoint": la sesión trabaja dentro de un
+    #       SAVEPOINT de la transacción externa en lugar de controlarla.
+    # ¿Para qué? Si el código de la app hace commit (o rollback), SQLAlchemy solo libera
+    #            (o revierte) el savepoint y abre otro; la transacción externa sigue viva
+    #            y se revierte al final del test.
     # ¿Impacto? Sin esto, un db.commit() en el service haría permanentes los datos
-    #           y romperían el aislamiento entre tests.
-    nested = connection.begin_nested()
-
-    @event.listens_for(session, "after_transaction_end")
-    def end_savepoint(session: Session, transaction_state: object) -> None:
-        """Recrea el savepoint después de cada commit dentro del test."""
-        nonlocal nested
-        if not nested.is_active:
-            nested = connection.begin_nested()
+    #           y rompería el aislamiento entre tests. Es el patrón que documenta
+    #           SQLAlchemy 2.0 y reemplaza al listener manual de after_transaction_end.
+    session = TestSessionLocal(
+        bind=connection, join_transaction_mode="create_savepoint"
+    )
 
     yield session
 
@@ -113,24 +162,49 @@ def db() -> Generator[Session, None, None]:
 # ────────────────────────────
 
 
+@pytest.fixture(scope="session")
+def app_client() -> Generator[TestClient, None, None]:
+    """Provee UN TestClient para toda la sesión de pytest.
+
+    ¿Qué? Entra al context manager de TestClient una sola vez: el lifespan de la app
+          (logging, calentamiento de la caché de sentencias, esquema OpenAPI, tarea de
+          limpieza de tokens) corre al inicio de la sesión y se cierra al final.
+    ¿Para qué? Con un cliente por test, cada test repetía el arranque y el apagado completo
+              de la app y creaba un portal de AnyIO nuevo.
+    ¿Impacto? Los tests no dependen del estado de la app entre tests: la BD, las cachés y
+              el rate limiter se reinician con los fixtures de abajo. La API no usa
+              cookies, así que compartir el cliente no filtra sesión entre tests.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
+
+
 @pytest.fixture()
-def client(db: Session) -> Generator[TestClient, None, None]:
-    """Provee un cliente HTTP de testing que usa la sesión de BD aislada.
+def client(db: Session, app_client: TestClient) -> Generator[TestClient, None, None]:
+    """Provee el cliente HTTP de testing conectado a la sesión de BD aislada del test.
 
-    ¿Qué? TestClient de FastAPI que envía peticiones HTTP sin necesidad de un servidor real.
+    ¿Qué? Reutiliza el TestClient de la sesión y solo cambia las dependencias de BD.
     ¿Para qué? Simular peticiones HTTP (POST, GET, etc.) en los tests sin levantar uvicorn.
     ¿Impacto? La clave es el dependency_overrides: reemplaza get_db de la app
               por una función que retorna la sesión de testing. Así, los endpoints
-              usan la BD de testing con rollback automático.
+              usan la BD de testing con rollback automático. Los overrides se limpian al
+              terminar cada test, porque `db` es distinta en cada uno.
     """
 
     def override_get_db() -> Generator[Session, None, None]:
         """Reemplaza la dependencia get_db para usar la sesión de testing."""
         yield db
 
+    def override_get_session_factory() -> Callable[[], AbstractContextManager[Session]]:
+        """Hace que las tareas en segundo plano usen la sesión de testing.
+
+        nullcontext evita que el `with` de la tarea cierre la sesión del test.
+        """
+        return lambda: nullcontext(db)
+
     app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as test_client:
-        yield test_client
+    app.dependency_overrides[get_session_factory] = override_get_session_factory
+    yield app_client
     app.dependency_overrides.clear()
 
 
@@ -157,6 +231,48 @@ def reset_rate_limiter() -> Generator[None, None, None]:
         pass  # Si el storage no implementa reset(), los límites son suficientemente altos
 
 
+@pytest.fixture(autouse=True)
+def reset_token_cache() -> Generator[None, None, None]:
+    """Vacía las cachés de access tokens y de usuarios entre tests.
+
+    ¿Qué? Fixture autouse que limpia las cachés de get_current_user después de cada test.
+    ¿Para qué? Cada test crea su propio usuario (con un id distinto) y la BD se revierte
+               al terminar. Dos tokens emitidos en el mismo segundo son idénticos, así que
+               sin limpiar la caché un test podría resolver el token al usuario de otro test.
+    ¿Impacto? Garantiza que cada test recorra el camino completo de validación del token.
+    """
+    yield
+    _TOKEN_CACHE.clear()
+    _USER_CACHE.clear()
+
+
+@pytest.fixture(autouse=True)
+def sent_emails(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, str, str]]:
+    """Reemplaza el envío de emails por un buzón en memoria durante cada test.
+
+    ¿Qué? Fixture autouse que sustituye send_verification_email y send_password_reset_email
+          (tal como los importa auth_service) por funciones que solo registran
+          (tipo, destinatario, token) en una lista.
+    ¿Para qué? Los tests prueban el flujo de la API, no el transporte: sin esto, un .env
+              local con SMTP_HOST o RESEND_API_KEY haría que la suite enviara correos
+              reales (o esperara el timeout de un SMTP inexistente), y aun en modo log
+              cada email renderiza el HTML y escribe en consola.
+    ¿Impacto? Los tests pueden pedir `sent_emails` para comprobar qué se envió. El
+              formato de los emails se prueba (si hace falta) sobre app.utils.email.
+    """
+    outbox: list[tuple[str, str, str]] = []
+
+    async def fake_verification(email: str, token: str) -> None:
+        outbox.append(("verification", email, token))
+
+    async def fake_password_reset(email: str, token: str) -> None:
+        outbox.append(("password_reset", email, token))
+
+    monkeypatch.setattr(auth_service, "send_verification_email", fake_verification)
+    monkeypatch.setattr(auth_service, "send_password_reset_email", fake_password_reset)
+    return outbox
+
+
 # ────────────────────────────
 # 👤 Fixtures de datos de prueba
 # ────────────────────────────
@@ -170,6 +286,14 @@ TEST_USER_LAST_NAME = "USER"
 TEST_USER_PASSWORD = "TestPass123"
 UNVERIFIED_USER_EMAIL = "unverified@nn-company.com"
 
+# ¿Qué? Hash de TEST_USER_PASSWORD calculado UNA vez al cargar conftest.
+# ¿Para qué? test_user y unverified_user se crean en casi todos los tests; hashear la
+#            misma contraseña constante en cada uno repite un argon2id completo por test.
+# ¿Impacto? El hash es real (mismo esquema y parámetros que la app), así que login y
+#           change-password lo verifican igual que a uno recién creado. Cada test sigue
+#           teniendo su propio usuario: solo se comparte el string del hash.
+TEST_USER_HASHED_PASSWORD = hash_password(TEST_USER_PASSWORD)
+
 
 @pytest.fixture()
 def test_user(db: Session) -> User:
@@ -178,14 +302,15 @@ def test_user(db: Session) -> User:
     ¿Qué? Fixture que inserta un usuario con datos conocidos en la BD de testing.
     ¿Para qué? Muchos tests necesitan un usuario existente (login, change password, etc.).
               Este fixture evita repetir la lógica de creación en cada test.
-    ¿Impacto? El usuario se crea con contraseña hasheada (como lo haría la app real).
-              Se revierte automáticamente al final del test gracias al fixture `db`.
+    ¿Impacto? El usuario se crea con contraseña hasheada (como lo haría la app real), usando
+              el hash precalculado TEST_USER_HASHED_PASSWORD. Se revierte automáticamente
+              al final del test gracias al fixture `db`.
     """
     user = User(
         email=TEST_USER_EMAIL,
         first_name=TEST_USER_FIRST_NAME,
         last_name=TEST_USER_LAST_NAME,
-        hashed_password=hash_password(TEST_USER_PASSWORD),
+        hashed_password=TEST_USER_HASHED_PASSWORD,
         # ¿Qué? El usuario de prueba se crea con email ya verificado.
         # ¿Para qué? Los tests de login, change-password, etc. asumen un usuario activo y verificado.
         # ¿Impacto? Sin esto, todos los tests de login fallarían con 403 "debes verificar tu email".
@@ -198,15 +323,79 @@ def test_user(db: Session) -> User:
 
 
 @pytest.fixture()
-def auth_headers(test_user: User) -> dict[str, str]:
+def tokens(test_user: User) -> dict[str, str]:
+    """Genera el par access/refresh que devolvería un login del usuario de prueba.
+
+    ¿Qué? Fixture que firma los mismos claims que login_user ("sub" y, en el refresh, "uid")
+          sin pasar por POST /login.
+    ¿Para qué? Los tests de refresh solo necesitan un token válido; el login real ya se
+              prueba en TestLogin y aquí costaría un verify de argon2 por test.
+    ¿Impacto? Es function-scoped porque test_user se revierte tras cada test: un token de
+              sesión apuntaría a un "uid" que ya no existe.
+    """
+    return {
+        "access_token": create_access_token(data={"sub": test_user.email}),
+        "refresh_token": create_refresh_token(
+            data={"sub": test_user.email, "uid": str(test_user.id)}
+        ),
+    }
+
+
+@pytest.fixture()
+def auth_headers(tokens: dict[str, str]) -> dict[str, str]:
     """Genera headers de autenticación con un access token válido.
 
     ¿Qué? Fixture que crea un token JWT para el usuario de prueba y lo formatea como header.
     ¿Para qué? Reutilizar en cualquier test que necesite autenticación.
     ¿Impacto? Sin esto, cada test protegido tendría que generar su propio token manualmente.
     """
-    access_token = create_access_token(data={"sub": test_user.email})
-    return {"Authorization": f"Bearer {access_token}"}
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+
+def _create_reset_tokens(
+    db: Session, user: User, **states: tuple[timedelta, bool]
+) -> dict[str, str]:
+    """Inserta varios tokens de reset para `user` con un solo add_all + commit.
+
+    ¿Qué? Por cada nombre recibe (desfase de expiración respecto a ahora, used) y retorna
+          {nombre: token en texto plano}.
+    ¿Para qué? Los fixtures de reset comparten la misma construcción; agrupar las filas evita
+              un commit (RELEASE + SAVEPOINT) y una recarga de `user` por cada token.
+    ¿Impacto? user.id se lee antes del commit, cuando el objeto aún no está expirado.
+
+    Args:
+        db: Sesión del fixture `db`.
+        user: Dueño de los tokens.
+        **states: nombre → (expires_in, used).
+
+    Returns:
+        Diccionario nombre → token en texto plano (lo que llegaría por email).
+    """
+    now = datetime.now(timezone.utc)
+    created: dict[str, str] = {}
+    records: list[PasswordResetToken] = []
+    for name, (expires_in, used) in states.items():
+        token, token_hash = generate_reset_token()
+        created[name] = token
+        records.append(
+            PasswordResetToken(
+                user_id=user.id,
+                token_hash=token_hash,
+                expires_at=now + expires_in,
+                used=used,
+            )
+        )
+    db.add_all(records)
+    db.commit()
+    return created
+
+
+# ¿Qué? Estados de token de reset que usan los tests: (expiración relativa, used).
+# ¿Para qué? Definir una sola vez qué significa "vigente", "expirado" y "usado".
+# ¿Impacto? Los fixtures individuales y `reset_tokens` crean exactamente las mismas filas.
+_VALID_RESET = (timedelta(hours=1), False)
+_EXPIRED_RESET = (timedelta(hours=-1), False)
+_USED_RESET = (timedelta(hours=1), True)
 
 
 @pytest.fixture()
@@ -217,15 +406,7 @@ def expired_reset_token(db: Session, test_user: User) -> str:
     ¿Para qué? Probar que el endpoint reset-password rechaza tokens expirados.
     ¿Impacto? Verifica una validación de seguridad crítica del sistema.
     """
-    token = str(uuid.uuid4())
-    token_record = PasswordResetToken(
-        user_id=test_user.id,
-        token=token,
-        expires_at=datetime.now(timezone.utc) - timedelta(hours=1),
-    )
-    db.add(token_record)
-    db.commit()
-    return token
+    return _create_reset_tokens(db, test_user, expired=_EXPIRED_RESET)["expired"]
 
 
 @pytest.fixture()
@@ -236,16 +417,7 @@ def used_reset_token(db: Session, test_user: User) -> str:
     ¿Para qué? Probar que el endpoint reset-password rechaza tokens ya utilizados.
     ¿Impacto? Verifica que un token no pueda reutilizarse para cambiar la contraseña múltiples veces.
     """
-    token = str(uuid.uuid4())
-    token_record = PasswordResetToken(
-        user_id=test_user.id,
-        token=token,
-        expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
-        used=True,
-    )
-    db.add(token_record)
-    db.commit()
-    return token
+    return _create_reset_tokens(db, test_user, used=_USED_RESET)["used"]
 
 
 @pytest.fixture()
@@ -256,20 +428,21 @@ def valid_reset_token(db: Session, test_user: User) -> str:
     ¿Para qué? Probar el flujo exitoso de reset-password.
     ¿Impacto? Simula el token que el usuario recibiría por email tras forgot-password.
     """
-    token = str(uuid.uuid4())
-    token_record = PasswordResetToken(
-        user_id=test_user.id,
-        token=token,
-        expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
-    )
-    db.add(token_record)
-    db.commit()
-    return token
+    return _create_reset_tokens(db, test_user, valid=_VALID_RESET)["valid"]
 
 
-# ────────────────────────────
-# 📧 Fixtures de verificación de email
-# ────────────────────────────
+@pytest.fixture()
+def reset_tokens(db: Session, test_user: User) -> dict[str, str]:
+    """Crea un token de reset vigente, uno expirado y uno usado en un solo commit.
+
+    ¿Qué? Fixture que retorna {"valid": ..., "expired": ..., "used": ...}.
+    ¿Para qué? Los tests que necesitan los tres estados a la vez (ej: la limpieza periódica)
+              no pagan tres commits pidiendo los fixtures individuales.
+    ¿Impacto? Las filas son idénticas a las de valid/expired/used_reset_token.
+    """
+    return _create_reset_tokens(
+        db, test_user, valid=_VALID_RESET, expired=_EXPIRED_RESET, used=_USED_RESET
+    )
 
 
 @pytest.fixture()
@@ -284,7 +457,7 @@ def unverified_user(db: Session) -> User:
         email=UNVERIFIED_USER_EMAIL,
         first_name="Unverified",
         last_name="User",
-        hashed_password=hash_password(TEST_USER_PASSWORD),
+        hashed_password=TEST_USER_HASHED_PASSWORD,
         is_email_verified=False,
     )
     db.add(user)
@@ -301,7 +474,7 @@ def valid_verification_token(db: Session, unverified_user: User) -> str:
     ¿Para qué? Probar el flujo exitoso de verify-email.
     ¿Impacto? Simula el token que se envía al email al registrarse.
     """
-    token = str(uuid.uuid4())
+    token = generate_verification_token()
     token_record = EmailVerificationToken(
         user_id=unverified_user.id,
         token=token,
@@ -320,7 +493,7 @@ def expired_verification_token(db: Session, unverified_user: User) -> str:
     ¿Para qué? Probar que el endpoint verify-email rechaza tokens expirados.
     ¿Impacto? Verifica la seguridad: enlaces viejos no pueden activar cuentas.
     """
-    token = str(uuid.uuid4())
+    token = generate_verification_token()
     token_record = EmailVerificationToken(
         user_id=unverified_user.id,
         token=token,
@@ -339,7 +512,7 @@ def used_verification_token(db: Session, unverified_user: User) -> str:
     ¿Para qué? Probar que el endpoint verify-email rechaza tokens ya consumidos.
     ¿Impacto? Verifica que un enlace no puede reutilizarse para activar la cuenta dos veces.
     """
-    token = str(uuid.uuid4())
+    token = generate_verification_token()
     token_record = EmailVerificationToken(
         user_id=unverified_user.id,
         token=token,
@@ -0,0 +1,154 @@
+"""
+Módulo: tests/test_cache.py
+Descripción: Tests unitarios de TTLCache (utils/cache.py).
+¿Para qué? Verificar expiración, desalojo LRU, invalidación y acceso concurrente sin
+           depender de los endpoints que usan la caché.
+¿Impacto? La caché decide si un token o un usuario se sirve sin ir a la BD: un error aquí
+          podría mantener vivo un token o un usuario desactivado más tiempo del debido.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import cache as cache_module
+from app.utils.cache import TTLCache
+
+
+class _FakeClock:
+    """Reloj monotónico controlado a mano para los tests de expiración."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _FakeClock:
+    """Reemplaza el reloj del módulo de caché por uno que avanza a mano.
+
+    ¿Qué? Sustituye el `time` que ve utils/cache.py (solo ese módulo) durante el test.
+    ¿Para qué? Probar la expiración sin sleep(): el test es instantáneo y determinista.
+    ¿Impacto? Sin esto, los tests de TTL dependerían del tiempo real y serían frágiles.
+    """
+    fake = _FakeClock()
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=fake))
+    return fake
+
+
+class TestTTLCache:
+    """Tests del contenedor TTLCache.
+
+    ¿Qué? Cubre get/set, expiración por TTL, desalojo por maxsize, pop y concurrencia.
+    ¿Para qué? Documentar y fijar el contrato que usan _TOKEN_CACHE y _USER_CACHE.
+    ¿Impacto? Si alguno falla, las cachés de dependencies.py pueden servir datos vencidos.
+    """
+
+    def test_get_returns_value_until_ttl_expires(self, clock: _FakeClock) -> None:
+        """Una entrada se sirve mientras no vence y desaparece justo al vencer."""
+        cache = TTLCache(maxsize=10, ttl=30)
+        cache.set("k", "v")
+
+        clock.now += 29.9
+        assert cache.get("k") == "v"
+
+        clock.now += 0.1
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_per_entry_ttl_is_capped_by_default(self, clock: _FakeClock) -> None:
+        """El TTL por entrada puede acortar la vida, pero nunca superar el TTL por defecto."""
+        cache = TTLCache(maxsize=10, ttl=30)
+        cache.set("short", 1, ttl=5)
+        cache.set("long", 2, ttl=300)
+
+        clock.now += 5
+        assert cache.get("short") is None
+        assert cache.get("long") == 2
+
+        clock.now += 25
+        assert cache.get("long") is None
+
+    @pytest.mark.parametrize(
+        ("maxsize", "ttl", "entry_ttl"), [(0, 30, None), (10, 0, None), (10, 30, -1)]
+    )
+    def test_disabled_cache_stores_nothing(
+        self, maxsize: int, ttl: float, entry_ttl: float | None
+    ) -> None:
+        """maxsize <= 0, TTL <= 0 o un TTL por entrada ya vencido no guardan nada."""
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        cache.set("k", "v", ttl=entry_ttl)
+
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_maxsize_evicts_least_recently_used(self, clock: _FakeClock) -> None:
+        """Al superar maxsize se desaloja la entrada leída/escrita hace más tiempo."""
+        cache = TTLCache(maxsize=2, ttl=30)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        # ¿Qué? Leer "a" la vuelve la más reciente; "b" pasa a ser la menos usada.
+        assert cache.get("a") == 1
+
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_set_existing_key_refreshes_value_and_ttl(self, clock: _FakeClock) -> None:
+        """Reescribir una clave reemplaza el valor y reinicia su expiración."""
+        cache = TTLCache(maxsize=10, ttl=30)
+        cache.set("k", "old")
+        clock.now += 20
+        cache.set("k", "new")
+        clock.now += 20
+
+        assert cache.get("k") == "new"
+
+    def test_pop_and_clear_invalidate(self, clock: _FakeClock) -> None:
+        """pop() elimina una clave (y tolera claves inexistentes); clear() las elimina todas."""
+        cache = TTLCache(maxsize=10, ttl=30)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.pop("a")
+        cache.pop("missing")
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_concurrent_access_keeps_bound(self) -> None:
+        """Muchos hilos escribiendo y leyendo a la vez → sin errores y sin superar maxsize.
+
+        ¿Qué? 8 hilos hacen set/get/pop sobre claves solapadas.
+        ¿Para qué? Los endpoints `def` corren en el threadpool y comparten la caché.
+        ¿Impacto? Sin el Lock, OrderedDict.move_to_end/popitem podrían lanzar KeyError
+                  o dejar la caché por encima de maxsize.
+        """
+        cache = TTLCache(maxsize=50, ttl=30)
+        barrier = threading.Barrier(8)
+
+        def worker(offset: int) -> None:
+            barrier.wait()
+            for i in range(2000):
+                key = (offset + i) % 120
+                cache.set(key, i)
+                cache.get(key)
+                if i % 7 == 0:
+                    cache.pop((key + 1) % 120)
+
+        # ¿Qué? future.result() re-lanza en este hilo cualquier excepción del worker.
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(worker, n * 15) for n in range(8)]
+            for future in futures:
+                future.result()
+
+        assert len(cache) <= 50
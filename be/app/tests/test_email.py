@@ -0,0 +1,166 @@
+"""
+Módulo: tests/test_email.py
+Descripción: Tests unitarios de la conexión SMTP reutilizada (utils/email.py).
+¿Para qué? Verificar que la conexión se reutiliza entre envíos, se reabre cuando el
+           servidor la cerró y se cierra en el shutdown, sin un servidor SMTP real.
+¿Impacto? conftest.py reemplaza send_verification_email/send_password_reset_email en los
+          tests de endpoints, así que _send_email_smtp solo se prueba aquí.
+"""
+
+import smtplib
+from collections.abc import Callable
+from email.message import Message
+from typing import ClassVar
+
+import pytest
+
+from app.config import settings
+from app.utils import email as email_module
+from app.utils.email import _send_email_smtp, close_smtp_connection
+
+
+class _FakeSMTP:
+    """Doble de smtplib.SMTP que registra conexiones, mensajes y cierres."""
+
+    instances: ClassVar[list["_FakeSMTP"]] = []
+
+    def __init__(self, host: str, port: int, timeout: float) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.sent: list[Message] = []
+        self.noop_calls = 0
+        self.noop_code = 250
+        self.fail_next_send: BaseException | None = None
+        self.on_send: Callable[[], None] | None = None
+        self.closed = False
+        _FakeSMTP.instances.append(self)
+
+    def noop(self) -> tuple[int, bytes]:
+        self.noop_calls += 1
+        return self.noop_code, b"OK"
+
+    def send_message(self, msg: Message) -> None:
+        if self.fail_next_send is not None:
+            error, self.fail_next_send = self.fail_next_send, None
+            raise error
+        if self.on_send is not None:
+            self.on_send()
+        self.sent.append(msg)
+
+    def login(self, user: str, password: str) -> None:
+        pass
+
+    def quit(self) -> None:
+        self.closed = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch: pytest.MonkeyPatch) -> type[_FakeSMTP]:
+    """Reemplaza smtplib.SMTP por _FakeSMTP y parte sin conexión guardada.
+
+    ¿Qué? Sustituye la clase que usa utils/email.py para abrir conexiones.
+    ¿Para qué? Contar conexiones y mensajes sin red ni servidor SMTP.
+    ¿Impacto? monkeypatch restaura smtplib.SMTP y la conexión guardada al terminar.
+    """
+    _FakeSMTP.instances = []
+    monkeypatch.setattr(email_module.smtplib, "SMTP", _FakeSMTP)
+    monkeypatch.setattr(email_module, "_smtp", None)
+    return _FakeSMTP
+
+
+def _send(to_email: str = "ana@nn-company.com") -> None:
+    _send_email_smtp(to_email, "Asunto", "<p>Hola</p>")
+
+
+class TestSmtpConnection:
+    """Tests del ciclo de vida de la conexión SMTP compartida.
+
+    ¿Qué? Cubre reutilización, reconexión, cierre y envíos simultáneos.
+    ¿Para qué? Fijar que el coste de conectar se paga una vez y que una conexión caída
+              no deja al worker sin poder enviar emails.
+    ¿Impacto? Un error aquí haría fallar emails de verificación y de reset de contraseña.
+    """
+
+    def test_connection_is_reused_with_timeout(
+        self, fake_smtp: type[_FakeSMTP]
+    ) -> None:
+        """Dos envíos → una sola conexión (con timeout), comprobada con NOOP."""
+        _send("ana@nn-company.com")
+        _send("beto@nn-company.com")
+
+        assert len(fake_smtp.instances) == 1
+        server = fake_smtp.instances[0]
+        assert server.timeout == settings.SMTP_TIMEOUT_SECONDS
+        assert [msg["To"] for msg in server.sent] == [
+            "ana@nn-company.com",
+            "beto@nn-company.com",
+        ]
+        assert server.noop_calls == 1
+        assert email_module._smtp is server
+
+    def test_reconnects_after_server_disconnected(
+        self, fake_smtp: type[_FakeSMTP]
+    ) -> None:
+        """Desconexión durante el envío → error al llamador y conexión nueva en el siguiente."""
+        _send()
+        first = fake_smtp.instances[0]
+        first.fail_next_send = smtplib.SMTPServerDisconnected("cerrada")
+
+        with pytest.raises(smtplib.SMTPServerDisconnected):
+            _send()
+
+        assert first.closed
+        assert email_module._smtp is None
+
+        _send()
+
+        assert len(fake_smtp.instances) == 2
+        assert len(fake_smtp.instances[1].sent) == 1
+
+    def test_reconnects_when_noop_fails(self, fake_smtp: type[_FakeSMTP]) -> None:
+        """NOOP sin 250 (el servidor cerró la sesión por inactividad) → se reabre."""
+        _send()
+        first = fake_smtp.instances[0]
+        first.noop_code = 421
+
+        _send()
+
+        assert first.closed
+        assert len(fake_smtp.instances) == 2
+        assert len(fake_smtp.instances[1].sent) == 1
+
+    def test_close_smtp_connection(self, fake_smtp: type[_FakeSMTP]) -> None:
+        """close_smtp_connection cierra la conexión guardada y tolera no tener ninguna."""
+        _send()
+
+        close_smtp_connection()
+        close_smtp_connection()
+
+        assert fake_smtp.instances[0].closed
+        assert email_module._smtp is None
+
+    def test_busy_connection_opens_a_separate_one(
+        self, fake_smtp: type[_FakeSMTP]
+    ) -> None:
+        """Un envío mientras la conexión está tomada → abre otra y guarda solo una.
+
+        ¿Qué? Durante el primer envío se lanza un segundo envío (como haría otro hilo).
+        ¿Para qué? Verificar que el segundo no espera al primero y que, al devolverlas,
+                  la conexión sobrante se cierra en lugar de acumularse.
+        ¿Impacto? Sin esto, un servidor lento bloquearía todos los envíos del worker.
+        """
+        _send()
+        first = fake_smtp.instances[0]
+        first.on_send = lambda: _send("beto@nn-company.com")
+
+        _send("ana@nn-company.com")
+
+        assert len(fake_smtp.instances) == 2
+        second = fake_smtp.instances[1]
+        assert [msg["To"] for msg in second.sent] == ["beto@nn-company.com"]
+        assert email_module._smtp is second
+        assert first.closed
@@ -0,0 +1,129 @@
+"""
+Módulo: tests/test_fast_route.py
+Descripción: Tests de FastRoute (routers/fast_route.py) sobre una app FastAPI mínima.
+¿Para qué? Verificar cuándo se omite la validación del response_model y que el status y
+           los headers fijados por el endpoint o sus dependencias llegan al cliente.
+¿Impacto? FastRoute decide si una respuesta se filtra contra su schema: un error aquí
+          podría exponer campos no declarados o perder headers de la respuesta.
+"""
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, Response
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.routers import fast_route
+from app.routers.fast_route import FastRoute
+
+
+class _Public(BaseModel):
+    name: str
+
+
+class _WithSecret(_Public):
+    secret: str
+
+
+def _set_dependency_header(response: Response) -> None:
+    response.headers["X-From-Dependency"] = "dep"
+
+
+def _build_app() -> FastAPI:
+    """App de prueba con un router FastRoute incluido con prefijo (como los reales)."""
+    router = APIRouter(prefix="/t", route_class=FastRoute)
+
+    @router.post("/declared", response_model=_Public, status_code=201)
+    def declared() -> _Public:
+        return _Public(name="ok")
+
+    @router.get("/subclass", response_model=_Public)
+    def subclass() -> _Public:
+        return _WithSecret(name="ok", secret="s3cr3t")
+
+    @router.get("/other-model", response_model=_Public)
+    async def other_model() -> _Public:
+        return _WithSecret.model_construct(name="ok", secret="s3cr3t")
+
+    @router.get(
+        "/headers",
+        response_model=_Public,
+        dependencies=[Depends(_set_dependency_header)],
+    )
+    async def headers(response: Response) -> _Public:
+        response.status_code = 202
+        response.headers["X-From-Endpoint"] = "endpoint"
+        return _Public(name="ok")
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+@pytest.fixture
+def fast_client() -> TestClient:
+    """Cliente HTTP contra la app de prueba (sin BD ni dependencias del proyecto)."""
+    return TestClient(_build_app())
+
+
+class TestFastRoute:
+    """Tests de la ruta que serializa directamente el response_model.
+
+    ¿Qué? Cubre el camino rápido, la vuelta al camino normal y la propagación de status
+          y headers de la Response temporal.
+    ¿Para qué? Fijar que solo se omite la validación cuando el tipo retornado es
+              exactamente el response_model declarado.
+    ¿Impacto? Si el camino rápido aceptara otros modelos, sus campos extra se filtrarían.
+    """
+
+    def test_declared_model_uses_fast_path(
+        self, fast_client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Retornar el response_model exacto → Response serializada por FastRoute + status."""
+        produced: list[type] = []
+        original = fast_route._to_response
+
+        def spy(result: object, route: object, sub_response: Response) -> object:
+            out = original(result, route, sub_response)  # type: ignore[arg-type]
+            produced.append(type(out))
+            return out
+
+        monkeypatch.setattr(fast_route, "_to_response", spy)
+
+        response = fast_client.post("/t/declared")
+
+        assert response.status_code == 201
+        assert response.json() == {"name": "ok"}
+        assert produced == [Response]
+
+    @pytest.mark.parametrize("path", ["/t/subclass", "/t/other-model"])
+    def test_other_model_is_filtered_by_response_model(
+        self, fast_client: TestClient, path: str
+    ) -> None:
+        """Retornar otro modelo con campos extra → FastAPI valida y los filtra.
+
+        ¿Qué? El endpoint declara _Public pero retorna _WithSecret (con o sin validar).
+        ¿Para qué? Verificar que el camino rápido no se usa y el campo no declarado
+                  no llega al cliente.
+        ¿Impacto? Sin esto, un endpoint que retorne el modelo equivocado filtraría datos.
+        """
+        response = fast_client.get(path)
+
+        assert response.status_code == 200
+        assert response.json() == {"name": "ok"}
+
+    def test_status_and_headers_from_sub_response_are_kept(
+        self, fast_client: TestClient
+    ) -> None:
+        """Status y headers fijados en `response: Response` (endpoint y dependencia) → se copian."""
+        response = fast_client.get("/t/headers")
+
+        assert response.status_code == 202
+        assert response.headers["X-From-Endpoint"] == "endpoint"
+        assert response.headers["X-From-Dependency"] == "dep"
+        assert response.json() == {"name": "ok"}
+
+    def test_hidden_parameter_not_in_openapi(self) -> None:
+        """El parámetro que inyecta la Response temporal no aparece en el esquema OpenAPI."""
+        schema = _build_app().openapi()
+
+        assert fast_route._SUB_RESPONSE_PARAM not in str(schema)
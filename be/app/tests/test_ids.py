@@ -0,0 +1,66 @@
+"""
+Módulo: tests/test_ids.py
+Descripción: Tests unitarios del generador uuid7 (utils/ids.py).
+¿Para qué? Verificar que las claves primarias generadas son UUID versión 7 válidos
+           y que crecen con el tiempo.
+¿Impacto? Si el orden temporal se rompe, los INSERT vuelven a repartirse por todo el
+          índice de la clave primaria — justo lo que uuid7 debía evitar.
+"""
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import ids as ids_module
+from app.utils.ids import uuid7
+
+
+class TestUuid7:
+    """Tests del helper uuid7.
+
+    ¿Qué? Comprueba versión, variante, timestamp embebido y orden entre milisegundos.
+    ¿Para qué? Los modelos usan uuid7 como default de su clave primaria.
+    ¿Impacto? Un bit de versión o variante mal puesto produce UUIDs no estándar.
+    """
+
+    def test_version_and_variant(self) -> None:
+        """El UUID generado es versión 7 con variante RFC 9562."""
+        value = uuid7()
+
+        assert isinstance(value, uuid.UUID)
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_embeds_current_unix_milliseconds(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Los 48 bits altos son el timestamp Unix en milisegundos."""
+        now_ns = 1_760_000_000_123_456_789
+        monkeypatch.setattr(ids_module, "time", SimpleNamespace(time_ns=lambda: now_ns))
+
+        assert uuid7().int >> 80 == now_ns // 1_000_000
+
+    def test_later_milliseconds_sort_after(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Un UUID generado en un milisegundo posterior siempre es mayor (y su str también).
+
+        ¿Qué? Genera ids en milisegundos crecientes con un reloj controlado.
+        ¿Para qué? Confirmar el orden que aprovecha el índice B-tree de la clave primaria.
+        ¿Impacto? Dentro del mismo milisegundo el orden es aleatorio (bits random): por eso
+                  el reloj avanza 1 ms entre cada id.
+        """
+        clock = SimpleNamespace(ns=1_760_000_000_000_000_000)
+
+        def time_ns() -> int:
+            clock.ns += 1_000_000
+            return clock.ns
+
+        monkeypatch.setattr(ids_module, "time", SimpleNamespace(time_ns=time_ns))
+
+        generated = [uuid7() for _ in range(50)]
+
+        assert generated == sorted(generated)
+        assert [str(v) for v in generated] == sorted(str(v) for v in generated)
+        assert len(set(generated)) == len(generated)
@@ -0,0 +1,55 @@
+"""
+Módulo: tests/test_security.py
+Descripción: Tests unitarios de la firma de JWT (utils/security.py).
+¿Para qué? Verificar que _encode_jwt produce exactamente el mismo token que jwt.encode(),
+           al que reemplaza en create_access_token y create_refresh_token.
+¿Impacto? Si el header, el payload o la firma difieren en un solo byte, los tokens
+          emitidos dejarían de ser intercambiables con los de PyJWT.
+"""
+
+import jwt
+import pytest
+
+from app.config import settings
+from app.utils.security import _encode_jwt, create_access_token, decode_token
+
+
+class TestEncodeJwt:
+    """Tests del codificador de JWT con HMAC precalculado.
+
+    ¿Qué? Compara _encode_jwt contra jwt.encode() con la misma clave y algoritmo.
+    ¿Para qué? Fijar que el atajo es solo una optimización, no otro formato de token.
+    ¿Impacto? Un token distinto podría no validar en otros servicios que usen PyJWT.
+    """
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {"sub": "0199f0c4-7a1b-7c3d-8e9f-0123456789ab", "exp": 1_760_000_900},
+            {
+                "sub": "ana",
+                "iat": 1_760_000_000,
+                "exp": 1_760_000_900,
+                "type": "access",
+            },
+            {"sub": "josé@nn-company.com", "roles": ["admin", "user"], "n": 1.5},
+        ],
+        ids=["minimal", "access_claims", "non_ascii_nested"],
+    )
+    def test_matches_pyjwt_encode(self, payload: dict[str, object]) -> None:
+        """El token es idéntico byte a byte al que genera jwt.encode()."""
+        expected = jwt.encode(
+            payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM
+        )
+
+        assert _encode_jwt(payload) == expected
+
+    def test_created_token_round_trips(self) -> None:
+        """Un access token creado con _encode_jwt se decodifica con decode_token."""
+        token = create_access_token(data={"sub": "ana"})
+
+        payload = decode_token(token, expected_type="access")
+
+        assert payload is not None
+        assert payload["sub"] == "ana"
+        assert payload["exp"] > payload["iat"]
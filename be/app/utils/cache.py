@@ -0,0 +1,101 @@
+"""
+Módulo: utils/cache.py
+Descripción: Caché en memoria con expiración por tiempo (TTL) y desalojo LRU.
+¿Para qué? Evitar repetir trabajo costoso y repetitivo dentro de un mismo proceso —
+           por ejemplo, decodificar el mismo JWT y buscar al mismo usuario en cada
+           una de las 5-20 peticiones que hace el frontend al cargar una página.
+¿Impacto? La caché es LOCAL a cada proceso (cada worker de Uvicorn tiene la suya) y sus
+          entradas expiran solas. Nunca se debe cachear algo cuyo dato obsoleto abra un
+          hueco de seguridad mayor que la ventana de TTL elegida.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class TTLCache:
+    """Caché acotada en tamaño con expiración por entrada, segura entre hilos.
+
+    ¿Qué? Diccionario ordenado donde cada valor guarda su instante de expiración
+          (reloj monotónico). Al superar `maxsize` se desaloja la entrada usada
+          hace más tiempo (LRU).
+    ¿Para qué? Los endpoints `def` de FastAPI corren en un threadpool, así que varios
+              hilos leen y escriben la caché a la vez — el Lock evita corromperla.
+    ¿Impacto? `maxsize` acota la memoria usada aunque lleguen millones de claves distintas;
+              el TTL acota cuánto tiempo puede servirse un dato desactualizado.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """Inicializa la caché vacía.
+
+        Args:
+            maxsize: Número máximo de entradas antes de desalojar la menos usada.
+            ttl: Segundos de vida por defecto de cada entrada.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Retorna el valor asociado a `key`, o None si no existe o ya expiró.
+
+        Args:
+            key: Clave a buscar.
+
+        Returns:
+            El valor cacheado, o None en caso de fallo (miss).
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """Guarda `value` bajo `key` durante `ttl` segundos (o el TTL por defecto).
+
+        ¿Qué? Inserta o reemplaza la entrada y desaloja la más antigua si se supera maxsize.
+        ¿Para qué? Permitir TTLs más cortos por entrada — ej: un JWT que expira en 10 s
+                  no debe quedar en caché 30 s.
+        ¿Impacto? Un TTL <= 0 no guarda nada: así se desactiva la caché desde la config.
+
+        Args:
+            key: Clave de la entrada.
+            value: Valor a guardar.
+            ttl: Segundos de vida de esta entrada; None usa el TTL por defecto.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Elimina `key` de la caché si existe (invalidación explícita).
+
+        Args:
+            key: Clave a eliminar.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Vacía la caché por completo (útil en tests y al cambiar configuración)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        """Número de entradas almacenadas (incluye las expiradas aún no purgadas)."""
+        return len(self._data)
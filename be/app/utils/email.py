@@ -20,6 +20,7 @@ Mailpit — probar emails localmente sin cuenta ni dominio:
 import asyncio
 import logging
 import smtplib
+import threading
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
@@ -32,6 +33,23 @@ from app.config import settings
 # ¿Impacto? En desarrollo, el enlace de verificación aparece aquí si no hay API key.
 logger = logging.getLogger(__name__)
 
+# ¿Qué? Línea separadora de los bloques de log con enlaces (modo desarrollo / fallback).
+# ¿Para qué? Se pasa como argumento %s al logger: construirla una sola vez al importar
+#            evita crear el string en cada llamada, aunque el nivel INFO esté desactivado.
+# ¿Impacto? Los mensajes usan formato diferido (%s) — si INFO no se emite, no se formatea nada.
+_LOG_SEPARATOR = "=" * 60
+
+# ¿Qué? Prefijos de los enlaces de los emails, construidos una vez al importar.
+# ¿Para qué? Cada envío solo concatena el token, sin leer settings ni formatear la URL base.
+# ¿Impacto? Los tokens salen de secrets.token_urlsafe (alfabeto base64 URL-safe): se pueden
+#           concatenar tal cual, sin quote(). Si el formato cambiara, habría que codificarlos.
+_VERIFY_URL_PREFIX = f"{settings.FRONTEND_URL}/verify-email?token="
+_RESET_URL_PREFIX = f"{settings.FRONTEND_URL}/reset-password?token="
+
+# ¿Qué? Remitente de los emails ("Nombre <email>"), igual para SMTP y Resend.
+# ¿Para qué? Formatearlo una vez al importar en lugar de en cada envío.
+_FROM_ADDRESS = f"{settings.RESEND_FROM_NAME} <{settings.RESEND_FROM_EMAIL}>"
+
 
 def _send_email_sync(params: resend.Emails.SendParams) -> None:
     """Ejecuta el envío de email de forma síncrona usando el SDK de Resend.
@@ -52,6 +70,98 @@ def _send_email_sync(params: resend.Emails.SendParams) -> None:
     resend.Emails.send(params)
 
 
+# ¿Qué? Conexión SMTP inactiva que se reutiliza entre envíos y el lock que la protege.
+# ¿Para qué? Abrir la conexión (TCP + EHLO + login) cuesta más que enviar el mensaje;
+#            reutilizarla amortiza ese coste entre todos los emails del worker.
+# ¿Impacto? SMTP es un protocolo con estado (MAIL FROM → RCPT TO → DATA): una conexión
+#           solo la usa un hilo a la vez. Cada envío la "toma" (la saca de _smtp) y la
+#           devuelve al terminar; el lock protege solo ese intercambio, nunca la red, así
+#           que un servidor lento no bloquea a los demás envíos. Si la conexión ya está
+#           tomada, el envío abre una propia y la cierra al terminar.
+_smtp: smtplib.SMTP | None = None
+_smtp_lock = threading.Lock()
+
+
+def _open_smtp() -> smtplib.SMTP:
+    """Abre una conexión SMTP nueva, autenticada si hay credenciales.
+
+    ¿Qué? Conecta con SMTP_HOST:SMTP_PORT con un timeout por operación de socket.
+    ¿Para qué? Sin timeout, un servidor que no responde dejaría el hilo colgado para
+              siempre (el default de smtplib es esperar indefinidamente).
+    ¿Impacto? Tras SMTP_TIMEOUT_SECONDS sin respuesta se lanza un OSError y el email cae
+              al fallback de consola.
+
+    Returns:
+        Conexión SMTP lista para enviar.
+    """
+    server = smtplib.SMTP(
+        settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SECONDS
+    )
+    # ¿Qué? Login opcional — Mailpit no requiere auth, Gmail sí.
+    # ¿Para qué? Solo autenticar si hay credenciales configuradas.
+    # ¿Impacto? Dejar SMTP_USERNAME vacío para Mailpit (no requiere autenticación).
+    if settings.SMTP_USERNAME:
+        server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+    return server
+
+
+def _quit_smtp(server: smtplib.SMTP) -> None:
+    """Cierra una conexión SMTP con QUIT, o cerrando el socket si QUIT falla."""
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        server.close()
+
+
+def _checkout_smtp() -> smtplib.SMTP:
+    """Toma la conexión SMTP inactiva (comprobándola con NOOP) o abre una nueva.
+
+    ¿Qué? Saca la conexión de _smtp bajo el lock y, ya fuera del lock, la comprueba.
+    ¿Para qué? El servidor cierra las conexiones inactivas tras un tiempo; sin la
+              comprobación, el primer envío tras una pausa larga fallaría.
+    ¿Impacto? NOOP, connect y login ocurren sin el lock: otro hilo que quiera enviar
+              no espera a este handshake.
+
+    Returns:
+        Conexión SMTP de uso exclusivo del hilo que llama, hasta _checkin_smtp().
+    """
+    global _smtp
+    with _smtp_lock:
+        server, _smtp = _smtp, None
+    if server is not None:
+        try:
+            if server.noop()[0] == 250:
+                return server
+        except (smtplib.SMTPException, OSError):
+            pass
+        _quit_smtp(server)
+    return _open_smtp()
+
+
+def _checkin_smtp(server: smtplib.SMTP) -> None:
+    """Devuelve una conexión sana para reutilizarla, o la cierra si ya hay otra guardada."""
+    global _smtp
+    with _smtp_lock:
+        if _smtp is None:
+            _smtp = server
+            return
+    _quit_smtp(server)
+
+
+def close_smtp_connection() -> None:
+    """Cierra la conexión SMTP inactiva, si existe.
+
+    ¿Qué? Envía QUIT y libera el socket de la conexión reutilizada.
+    ¿Para qué? Se llama al apagar la app (lifespan) para cerrar la sesión SMTP limpiamente.
+    ¿Impacto? Sin esto, el servidor SMTP vería una desconexión abrupta en cada despliegue.
+    """
+    global _smtp
+    with _smtp_lock:
+        server, _smtp = _smtp, None
+    if server is not None:
+        _quit_smtp(server)
+
+
 def _send_email_smtp(to_email: str, subject: str, html: str) -> None:
     """Envía un email usando un servidor SMTP con la biblioteca estándar de Python.
 
@@ -71,21 +181,22 @@ def _send_email_smtp(to_email: str, subject: str, html: str) -> None:
     # ¿Impacto? Sin "alternative", algunos clientes de email podrían no renderizar el HTML.
     msg = MIMEMultipart("alternative")
     msg["Subject"] = subject
-    msg["From"] = f"{settings.RESEND_FROM_NAME} <{settings.RESEND_FROM_EMAIL}>"
+    msg["From"] = _FROM_ADDRESS
     msg["To"] = to_email
     msg.attach(MIMEText(html, "html"))
 
-    # ¿Qué? Abre conexión al servidor SMTP y envía el mensaje.
+    # ¿Qué? Envía el mensaje por la conexión SMTP compartida.
     # ¿Para qué? SMTP es el protocolo universal de envío de correos — funciona con Mailpit,
     #            Gmail (STARTTLS, puerto 587), Mailtrap, SendGrid SMTP, etc.
-    # ¿Impacto? El with-block cierra la conexión automáticamente (evita resource leaks).
-    with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-        # ¿Qué? Login opcional — Mailpit no requiere auth, Gmail sí.
-        # ¿Para qué? Solo autenticar si hay credenciales configuradas.
-        # ¿Impacto? Dejar SMTP_USERNAME vacío para Mailpit (no requiere autenticación).
-        if settings.SMTP_USERNAME:
-            server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+    # ¿Impacto? Si el envío falla a mitad de sesión, la conexión se descarta para que el
+    #           siguiente email abra una nueva en lugar de heredar un estado inconsistente.
+    server = _checkout_smtp()
+    try:
         server.send_message(msg)
+    except Exception:
+        _quit_smtp(server)
+        raise
+    _checkin_smtp(server)
 
 
 async def send_verification_email(email: str, token: str) -> None:
@@ -100,9 +211,9 @@ async def send_verification_email(email: str, token: str) -> None:
 
     Args:
         email: Dirección de email del usuario recién registrado.
-        token: Token único de verificación (UUID) generado al registrar.
+        token: Token único de verificación (`secrets.token_urlsafe(16)`) generado al registrar.
     """
-    verification_url = f"{settings.FRONTEND_URL}/verify-email?token={token}"
+    verification_url = _VERIFY_URL_PREFIX + token
     subject = "NN Auth System — Verifica tu cuenta"
     html_content = f"""
     <html>
@@ -153,10 +264,10 @@ async def send_verification_email(email: str, token: str) -> None:
                 "   Para: %s\n"
                 "   Enlace: %s\n"
                 "%s",
-                "=" * 60,
+                _LOG_SEPARATOR,
                 email,
                 verification_url,
-                "=" * 60,
+                _LOG_SEPARATOR,
             )
         return
 
@@ -175,15 +286,15 @@ async def send_verification_email(email: str, token: str) -> None:
             "   Para: %s\n"
             "   Enlace: %s\n"
             "%s",
-            "=" * 60,
+            _LOG_SEPARATOR,
             email,
             verification_url,
-            "=" * 60,
+            _LOG_SEPARATOR,
         )
         return
 
     params: resend.Emails.SendParams = {
-        "from": f"{settings.RESEND_FROM_NAME} <{settings.RESEND_FROM_EMAIL}>",
+        "from": _FROM_ADDRESS,
         "to": [email],
         "subject": subject,
         "html": html_content,
@@ -206,10 +317,10 @@ async def send_verification_email(email: str, token: str) -> None:
             "   Para: %s\n"
             "   Enlace: %s\n"
             "%s",
-            "=" * 60,
+            _LOG_SEPARATOR,
             email,
             verification_url,
-            "=" * 60,
+            _LOG_SEPARATOR,
         )
 
 
@@ -223,9 +334,9 @@ async def send_password_reset_email(email: str, token: str) -> None:
 
     Args:
         email: Dirección de email del usuario que solicitó el reset.
-        token: Token único de recuperación (UUID) generado por el sistema.
+        token: Token único de recuperación (`secrets.token_urlsafe(32)`) generado por el sistema.
     """
-    reset_url = f"{settings.FRONTEND_URL}/reset-password?token={token}"
+    reset_url = _RESET_URL_PREFIX + token
     subject = "NN Auth System — Recuperación de contraseña"
     html_content = f"""
     <html>
@@ -271,10 +382,10 @@ async def send_password_reset_email(email: str, token: str) -> None:
                 "   Para: %s\n"
                 "   Enlace: %s\n"
                 "%s",
-                "=" * 60,
+                _LOG_SEPARATOR,
                 email,
                 reset_url,
-                "=" * 60,
+                _LOG_SEPARATOR,
             )
         return
 
@@ -287,15 +398,15 @@ async def send_password_reset_email(email: str, token: str) -> None:
             "   Para: %s\n"
             "   Enlace: %s\n"
             "%s",
-            "=" * 60,
+            _LOG_SEPARATOR,
             email,
             reset_url,
-            "=" * 60,
+            _LOG_SEPARATOR,
         )
         return
 
     params: resend.Emails.SendParams = {
-        "from": f"{settings.RESEND_FROM_NAME} <{settings.RESEND_FROM_EMAIL}>",
+        "from": _FROM_ADDRESS,
         "to": [email],
         "subject": subject,
         "html": html_content,
@@ -315,9 +426,9 @@ async def send_password_reset_email(email: str, token: str) -> None:
             "   Para: %s\n"
             "   Enlace: %s\n"
             "%s",
-            "=" * 60,
+            _LOG_SEPARATOR,
             email,
             reset_url,
-            "=" * 60,
+            _LOG_SEPARATOR,
         )
 
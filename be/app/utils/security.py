@@ -8,31 +8,223 @@ Descripción: Utilidades de seguridad — hashing de contraseñas y manejo de to
           Si los JWT se generan mal, cualquiera podría suplantar usuarios.
 """
 
-from datetime import datetime, timedelta, timezone
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import timedelta
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import bcrypt
+import jwt
+from anyio import to_thread
+from argon2 import PasswordHasher, Type
+from argon2.exceptions import InvalidHashError, VerificationError
+from fastapi import HTTPException, status
 
 from app.config import settings
 
-# ¿Qué? Contexto de hashing de contraseñas usando bcrypt.
-# ¿Para qué? Proveer una interfaz unificada para hashear y verificar contraseñas.
-#            bcrypt es un algoritmo diseñado específicamente para contraseñas:
-#            es deliberadamente LENTO para dificultar ataques de fuerza bruta.
-# ¿Impacto? deprecated="auto" indica que si en el futuro se cambia el algoritmo,
-#           los hashes antiguos seguirán siendo verificables (migración gradual).
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# ¿Qué? Hasher de contraseñas: argon2id (argon2-cffi) para todos los hashes nuevos.
+# ¿Para qué? argon2id (ganador de la Password Hashing Competition) es el algoritmo que
+#            OWASP recomienda primero: además de lento es "memory-hard" (19 MiB por hash),
+#            lo que encarece los ataques con GPU/ASIC mucho más que bcrypt.
+# ¿Impacto? Con los parámetros mínimos de OWASP (m=19 MiB, t=2, p=1, los defaults de
+#           PASSWORD_HASH_*) un hash tarda ~20-40 ms frente a los ~60-250 ms de bcrypt
+#           cost 12: menos CPU por login. Si se suben en la config, check_needs_rehash
+#           detecta los hashes con parámetros viejos y login_user los re-hashea.
+#           Se usa argon2-cffi directamente (sin passlib): el formato PHC ($argon2id$...)
+#           es el mismo, así que los hashes ya guardados se siguen verificando.
+_ARGON2 = PasswordHasher(
+    time_cost=settings.PASSWORD_HASH_TIME_COST,
+    memory_cost=settings.PASSWORD_HASH_MEMORY_COST,
+    parallelism=settings.PASSWORD_HASH_PARALLELISM,
+    type=Type.ID,
+)
 
-# ¿Qué? Hash bcrypt fijo (sin usuario real detrás), usado por login_user cuando
-#       el email no existe, para comparar contra algo y no saltarse el costo de bcrypt.
+# ¿Qué? Prefijos de los hashes bcrypt legados ($2b$ y sus variantes históricas).
+# ¿Para qué? bcrypt ya no genera hashes nuevos: solo se verifica para las cuentas creadas
+#            antes de argon2id, que se re-hashean en su siguiente login exitoso
+#            (ver verify_and_update_password).
+# ¿Impacto? bcrypt solo usa los primeros 72 bytes de la contraseña; se truncan igual que
+#           al crear esos hashes para que sigan coincidiendo.
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+_BCRYPT_MAX_BYTES = 72
+# ¿Qué? Largo exacto de un hash bcrypt bien formado ("$2b$" + costo + "$" + sal + hash).
+# ¿Para qué? bcrypt 4.0 no lanza ValueError con una sal truncada: el binding en Rust
+#            aborta con PanicException, que ningún `except ValueError` atrapa.
+# ¿Impacto? Un hash corrupto en la BD se trata como "no coincide" en vez de dar un 500.
+_BCRYPT_HASH_LENGTH = 60
+
+# ¿Qué? Hash fijo (sin usuario real detrás), usado por login_user cuando el email no
+#       existe, para comparar contra algo y no saltarse el costo del hashing.
 # ¿Para qué? Igualar el tiempo de respuesta del login exista o no el usuario — el
 #            mensaje de error ya es genérico, pero sin esto el timing sigue delatando
 #            qué emails están registrados (OWASP A07).
-DUMMY_PASSWORD_HASH = "$2b$12$PP42s5XkiNf/2WWHS19shOf.vg.RJnNq7zCJDTCAmQNCrYZdKV85S"
+# ¿Impacto? Se genera al importar con argon2id y los parámetros configurados,
+#           así su verificación cuesta lo mismo que la de un hash real recién creado.
+DUMMY_PASSWORD_HASH = _ARGON2.hash(secrets.token_urlsafe(32))
+
+# ¿Qué? Semáforo que limita cuántos hashes de contraseña corren a la vez en este worker.
+# ¿Para qué? Que una ráfaga de logins/registros no ocupe todos los hilos del threadpool
+#            con trabajo de CPU y deje sin hilos a los endpoints baratos.
+# ¿Impacto? threading (no asyncio): se adquiere siempre desde un hilo del threadpool,
+#           nunca desde el event loop.
+_PASSWORD_HASH_SLOTS = threading.BoundedSemaphore(
+    settings.PASSWORD_HASH_MAX_CONCURRENCY
+)
+
+
+@contextmanager
+def _password_hash_slot() -> Iterator[None]:
+    """Reserva un turno para hashear/verificar una contraseña.
+
+    ¿Qué? Espera como máximo PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS a que haya un turno libre.
+    ¿Para qué? Acotar el trabajo de hashing simultáneo y fallar de forma explícita bajo
+              saturación en lugar de encolar requests sin límite.
+    ¿Impacto? Si no hay turno a tiempo, el request responde 503 con Retry-After: 1.
+
+    Raises:
+        HTTPException 503: Si no se obtuvo un turno dentro del tiempo máximo.
+    """
+    if not _PASSWORD_HASH_SLOTS.acquire(
+        timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado, intenta de nuevo en unos segundos",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        yield
+    finally:
+        _PASSWORD_HASH_SLOTS.release()
+
+
+# ¿Qué? SECRET_KEY codificada a bytes UNA vez al importar el módulo.
+# ¿Para qué? PyJWT firma y verifica con la clave en bytes; con el string tendría que
+#            codificarla de nuevo en cada jwt.encode()/jwt.decode().
+# ¿Impacto? La firma es la misma (HMAC con settings.ALGORITHM); PyJWT delega el HMAC en
+#           hmac/hashlib de la stdlib (OpenSSL) y compara firmas en tiempo constante.
+_JWT_SIGNING_KEY = settings.SECRET_KEY.encode()
+
+# ¿Qué? Algoritmo de firma y la lista de algoritmos aceptados al decodificar, fijados al importar.
+# ¿Para qué? decode_token corre en cada request autenticado sin caché: así no lee settings
+#            ni construye una lista nueva [settings.ALGORITHM] en cada llamada.
+# ¿Impacto? settings no cambia en runtime (igual que SECRET_KEY arriba); una tupla
+#           de un solo elemento mantiene la protección contra "alg confusion".
+_JWT_ALGORITHM = settings.ALGORITHM
+_JWT_ALGORITHMS = (_JWT_ALGORITHM,)
+
+# ¿Qué? Función hash de cada algoritmo HMAC de JWT (RFC 7518 §3.2).
+# ¿Para qué? Con un algoritmo HS* los tokens se firman sin jwt.encode() (ver _encode_jwt).
+# ¿Impacto? Con otro algoritmo (ej: RS256) se sigue usando jwt.encode() tal cual.
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+# ¿Qué? Longitud máxima aceptada para un JWT antes de intentar decodificarlo.
+# ¿Para qué? Cortar en seco entradas gigantes (ver decode_token).
+_MAX_JWT_LENGTH = 8192
+
+
+def _b64url(raw: bytes) -> bytes:
+    """Codifica en base64url sin relleno "=", como exige JWS (RFC 7515 §2)."""
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+
+# ¿Qué? Header del JWT ya serializado y codificado, y un HMAC con la clave ya cargada.
+# ¿Para qué? Ambos son idénticos en todos los tokens: jwt.encode() los recalcula en cada
+#            llamada (resuelve el algoritmo, serializa el header, prepara la clave HMAC).
+#            Aquí se calculan una vez y cada firma solo hace hmac.copy() + update().
+# ¿Impacto? El header es el mismo que genera PyJWT ({"alg":...,"typ":"JWT"}, claves
+#           ordenadas), así que los tokens son byte a byte iguales y decode_token los
+#           sigue verificando con jwt.decode(). None si el algoritmo no es HMAC.
+_JWT_HEADER_SEGMENT = _b64url(
+    json.dumps({"alg": _JWT_ALGORITHM, "typ": "JWT"}, separators=(",", ":")).encode()
+)
+_JWT_HMAC = (
+    hmac.new(_JWT_SIGNING_KEY, digestmod=_HMAC_DIGESTS[_JWT_ALGORITHM])
+    if _JWT_ALGORITHM in _HMAC_DIGESTS
+    else None
+)
+
+
+def _encode_jwt(payload: dict) -> str:
+    """Firma un payload como JWT compacto (header.payload.firma).
+
+    ¿Qué? Serializa el payload, lo concatena al header precalculado y firma con HMAC.
+    ¿Para qué? Evitar en cada token el trabajo invariante de jwt.encode() (ver _JWT_HMAC).
+    ¿Impacto? hmac/hashlib usan OpenSSL, igual que PyJWT: la firma es la misma, solo
+              desaparece el trabajo repetido en Python alrededor de ella.
+
+    Args:
+        payload: Claims del token (valores serializables a JSON).
+
+    Returns:
+        Token JWT como string.
+    """
+    if _JWT_HMAC is None:
+        return jwt.encode(payload, _JWT_SIGNING_KEY, algorithm=_JWT_ALGORITHM)
+    signing_input = (
+        _JWT_HEADER_SEGMENT
+        + b"."
+        + _b64url(json.dumps(payload, separators=(",", ":")).encode())
+    )
+    mac = _JWT_HMAC.copy()
+    mac.update(signing_input)
+    return (signing_input + b"." + _b64url(mac.digest())).decode()
+
+
+# ¿Qué? Duración por defecto de cada tipo de token, en segundos, calculada al importar.
+# ¿Para qué? "exp" se guarda en el JWT como segundos Unix (NumericDate): con la duración ya
+#            en segundos basta sumarla a time.time(), sin construir datetime ni timedelta
+#            en cada token ni convertirlos a epoch dentro de jwt.encode().
+# ¿Impacto? El valor de "exp" es el mismo que antes (PyJWT ya truncaba a segundos enteros).
+_ACCESS_TOKEN_TTL_SECONDS = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_REFRESH_TOKEN_TTL_SECONDS = settings.REFRESH_TOKEN_EXPIRE_DAYS * 86_400
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    """Compara una contraseña con su hash usando el algoritmo que indica el prefijo.
+
+    ¿Qué? bcrypt para los hashes legados ($2b$...), argon2id para el resto.
+    ¿Para qué? Un solo lugar con la lógica que comparten verify_password y
+              verify_and_update_password.
+    ¿Impacto? Un hash con formato irreconocible cuenta como "no coincide" (False), nunca
+              como error 500.
+
+    Args:
+        plain_password: Contraseña en texto plano ingresada por el usuario.
+        hashed_password: Hash (argon2id o bcrypt legado) almacenado en la base de datos.
+
+    Returns:
+        True si la contraseña coincide, False en caso contrario.
+    """
+    if hashed_password.startswith(_BCRYPT_PREFIXES):
+        if len(hashed_password) != _BCRYPT_HASH_LENGTH:
+            return False
+        try:
+            return bcrypt.checkpw(
+                plain_password.encode()[:_BCRYPT_MAX_BYTES], hashed_password.encode()
+            )
+        except ValueError:
+            # ¿Qué? Costo o sal inválidos ("Invalid salt") en un hash de largo correcto.
+            return False
+    try:
+        return _ARGON2.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
 
 
 def hash_password(password: str) -> str:
-    """Hashea una contraseña en texto plano usando bcrypt.
+    """Hashea una contraseña en texto plano usando argon2id.
 
     ¿Qué? Toma una contraseña legible y la convierte en un hash irreversible.
     ¿Para qué? Almacenar la contraseña de forma segura en la base de datos.
@@ -44,9 +236,30 @@ def hash_password(password: str) -> str:
         password: Contraseña en texto plano ingresada por el usuario.
 
     Returns:
-        Hash bcrypt de la contraseña (~60 caracteres).
+        Hash argon2id de la contraseña en formato PHC ($argon2id$..., ~97 caracteres).
+
+    Raises:
+        HTTPException 503: Si el servidor está saturado de hashes de contraseña.
+    """
+    with _password_hash_slot():
+        return _ARGON2.hash(password)
+
+
+async def hash_password_async(password: str) -> str:
+    """Versión para endpoints `async def` de hash_password.
+
+    ¿Qué? Ejecuta hash_password en el threadpool de AnyIO y espera el resultado.
+    ¿Para qué? El hashing bloquea el hilo que lo ejecuta decenas de ms; llamado directamente
+              desde una corrutina, congela el event loop y TODOS los requests del worker esperan.
+    ¿Impacto? Los endpoints `def` ya corren en el threadpool y usan hash_password directo.
+
+    Args:
+        password: Contraseña en texto plano ingresada por el usuario.
+
+    Returns:
+        Hash argon2id de la contraseña.
     """
-    return pwd_context.hash(password)
+    return await to_thread.run_sync(hash_password, password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -55,16 +268,73 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     ¿Qué? Compara una contraseña ingresada contra el hash almacenado en la BD.
     ¿Para qué? Validar las credenciales del usuario durante el login y el cambio de contraseña.
     ¿Impacto? Es el mecanismo central de verificación — si falla, nadie puede autenticarse.
-              bcrypt internamente aplica el mismo salt del hash original para comparar.
+              El prefijo del hash ($argon2id$ o $2b$) indica el algoritmo, y se aplican el
+              mismo salt y parámetros del hash original para comparar.
 
     Args:
         plain_password: Contraseña en texto plano ingresada por el usuario.
-        hashed_password: Hash bcrypt almacenado en la base de datos.
+        hashed_password: Hash (argon2id o bcrypt legado) almacenado en la base de datos.
 
     Returns:
         True si la contraseña coincide, False en caso contrario.
+
+    Raises:
+        HTTPException 503: Si el servidor está saturado de hashes de contraseña.
+    """
+    with _password_hash_slot():
+        return _verify(plain_password, hashed_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Versión para endpoints `async def` de verify_password.
+
+    ¿Qué? Ejecuta verify_password en el threadpool de AnyIO y espera el resultado.
+    ¿Para qué? Igual que hash_password_async: no bloquear el event loop mientras se calcula
+              el hash.
+    ¿Impacto? argon2-cffi y bcrypt liberan el GIL durante el cálculo, así que dos
+              llamadas concurrentes usan dos núcleos.
+
+    Args:
+        plain_password: Contraseña en texto plano ingresada por el usuario.
+        hashed_password: Hash (argon2id o bcrypt legado) almacenado en la base de datos.
+
+    Returns:
+        True si la contraseña coincide, False en caso contrario.
+    """
+    return await to_thread.run_sync(verify_password, plain_password, hashed_password)
+
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verifica una contraseña y, si su hash es obsoleto, genera el reemplazo.
+
+    ¿Qué? Igual que verify_password, pero si el hash almacenado usa un esquema o parámetros
+          obsoletos (ej: bcrypt), retorna además un hash nuevo con el esquema actual.
+    ¿Para qué? Migrar los hashes bcrypt a argon2id de forma gradual, sin forzar a nadie a
+              cambiar su contraseña: solo en el login se conoce la contraseña en claro.
+    ¿Impacto? El llamador debe guardar el hash nuevo en la BD. Un login con hash legado
+              paga una verificación bcrypt + un hash argon2id una única vez.
+
+    Args:
+        plain_password: Contraseña en texto plano ingresada por el usuario.
+        hashed_password: Hash almacenado en la base de datos.
+
+    Returns:
+        Tupla (coincide, hash_nuevo). hash_nuevo es None si no hace falta actualizarlo.
+
+    Raises:
+        HTTPException 503: Si el servidor está saturado de hashes de contraseña.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    with _password_hash_slot():
+        if not _verify(plain_password, hashed_password):
+            return False, None
+        # ¿Qué? Obsoleto = bcrypt legado, o argon2id con parámetros distintos a los actuales.
+        if hashed_password.startswith(_BCRYPT_PREFIXES) or _ARGON2.check_needs_rehash(
+            hashed_password
+        ):
+            return True, _ARGON2.hash(plain_password)
+        return True, None
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -83,23 +353,18 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     Returns:
         Token JWT como string codificado.
     """
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
-    # ¿Qué? "exp" es un claim estándar de JWT que indica cuándo expira el token.
+    now = int(time.time())
+    ttl = (
+        int(expires_delta.total_seconds())
+        if expires_delta
+        else _ACCESS_TOKEN_TTL_SECONDS
+    )
+    # ¿Qué? "exp" es un claim estándar de JWT que indica cuándo expira el token; "iat" indica
+    #       cuándo se emitió. Ambos son segundos Unix enteros calculados desde el mismo `now`.
     # ¿Para qué? El servidor rechaza automáticamente tokens expirados al decodificar.
     # ¿Impacto? Sin expiración, un token robado sería válido para siempre.
-    to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM,
-    )
-    return encoded_jwt
+    to_encode = {**data, "iat": now, "exp": now + ttl, "type": "access"}
+    return _encode_jwt(to_encode)
 
 
 def create_refresh_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -120,27 +385,21 @@ def create_refresh_token(data: dict, expires_delta: timedelta | None = None) ->
     Returns:
         Token JWT de refresco como string.
     """
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            days=settings.REFRESH_TOKEN_EXPIRE_DAYS
-        )
+    now = int(time.time())
+    ttl = (
+        int(expires_delta.total_seconds())
+        if expires_delta
+        else _REFRESH_TOKEN_TTL_SECONDS
+    )
     # ¿Qué? "type": "refresh" diferencia este token del access token.
     # ¿Para qué? Evitar que un refresh token sea usado como access token y viceversa.
     # ¿Impacto? Sin esta distinción, un refresh token podría usarse para acceder a endpoints
     #           protegidos, anulando el propósito de tener tokens de corta duración.
-    to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM,
-    )
-    return encoded_jwt
+    to_encode = {**data, "iat": now, "exp": now + ttl, "type": "refresh"}
+    return _encode_jwt(to_encode)
 
 
-def decode_token(token: str) -> dict | None:
+def decode_token(token: str, expected_type: str | None = None) -> dict | None:
     """Decodifica y verifica un token JWT.
 
     ¿Qué? Toma un token JWT string, verifica su firma y expiración, y retorna los datos.
@@ -150,20 +409,85 @@ def decode_token(token: str) -> dict | None:
 
     Args:
         token: Token JWT como string.
+        expected_type: Si se indica ("access" o "refresh"), el claim "type" debe coincidir.
 
     Returns:
         Diccionario con los datos del token (payload) si es válido, None si no lo es.
     """
+    # ¿Qué? Descartar de entrada lo que no puede ser un JWT: sin exactamente 3 segmentos,
+    #       con caracteres no ASCII o de un tamaño absurdo.
+    # ¿Para qué? jwt.decode() decodifica base64 y JSON antes de fallar; un atacante que
+    #            envía basura en el header Authorization no debería costar ese trabajo.
+    # ¿Impacto? Un token legítimo mide ~250 caracteres: el límite no afecta a ninguno.
+    if len(token) > _MAX_JWT_LENGTH or token.count(".") != 2 or not token.isascii():
+        return None
+
     try:
         payload = jwt.decode(
             token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM],
+            _JWT_SIGNING_KEY,
+            algorithms=_JWT_ALGORITHMS,
         )
-        return payload
-    except JWTError:
-        # ¿Qué? JWTError captura tokens expirados, mal formados, o con firma inválida.
+    except jwt.InvalidTokenError:
+        # ¿Qué? InvalidTokenError captura tokens expirados, mal formados, o con firma inválida.
         # ¿Para qué? Manejar todos los errores de JWT en un solo lugar.
         # ¿Impacto? Retornar None en lugar de lanzar excepción permite al caller
         #           decidir cómo manejar el error (401, redirect a login, etc.).
         return None
+
+    # ¿Qué? Rechazar un token válido pero del tipo equivocado (ej: refresh usado como access).
+    # ¿Para qué? Que cada caller reciba ya validados firma, expiración Y tipo en una sola
+    #            llamada, con el mismo resultado (None) para cualquier token inaceptable.
+    # ¿Impacto? Sin expected_type el tipo no se comprueba — el caller asume esa responsabilidad.
+    if expected_type is not None and payload.get("type") != expected_type:
+        return None
+    return payload
+
+
+def generate_reset_token() -> tuple[str, str]:
+    """Genera un token de recuperación de contraseña y su hash para almacenar.
+
+    ¿Qué? Crea un token aleatorio URL-safe (32 bytes = 256 bits) y calcula su SHA-256.
+    ¿Para qué? El token en claro va SOLO en el enlace del email; en la BD se guarda el hash.
+    ¿Impacto? secrets usa el generador criptográfico del sistema operativo (os.urandom),
+              así que el token es impredecible (OWASP A02).
+
+    Returns:
+        Tupla (token en claro para el email, hash hex de 64 caracteres para la BD).
+    """
+    raw_token = secrets.token_urlsafe(32)
+    return raw_token, hash_reset_token(raw_token)
+
+
+def generate_verification_token() -> str:
+    """Genera el token del enlace de verificación de email.
+
+    ¿Qué? 16 bytes aleatorios (128 bits) codificados en base64 URL-safe: 22 caracteres.
+    ¿Para qué? Reemplaza a str(uuid.uuid4()) (36 caracteres, 122 bits): más entropía en
+              menos bytes, así la fila y la clave del índice UNIQUE de
+              email_verification_tokens.token son más chicas y el enlace más corto.
+    ¿Impacto? secrets usa os.urandom, la misma fuente que uuid4. Los tokens UUID ya
+              emitidos siguen siendo válidos: la columna acepta ambos formatos.
+
+    Returns:
+        Token URL-safe de 22 caracteres.
+    """
+    return secrets.token_urlsafe(16)
+
+
+def hash_reset_token(token: str) -> str:
+    """Calcula el hash SHA-256 (hex) de un token de recuperación.
+
+    ¿Qué? Aplica SHA-256 al token recibido y retorna su representación hexadecimal.
+    ¿Para qué? Buscar en la BD por hash: el token enviado por el usuario nunca se compara
+              ni se guarda en claro.
+    ¿Impacto? Un hash rápido es suficiente (a diferencia de las contraseñas) porque el token
+              tiene 256 bits de entropía: no existe un diccionario contra el cual atacarlo.
+
+    Args:
+        token: Token en claro recibido desde el enlace del email.
+
+    Returns:
+        Hash SHA-256 en hexadecimal (64 caracteres).
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
@@ -89,7 +89,7 @@ export async function resetPassword(data: ResetPasswordRequest): Promise<Message
 
 /**
  * ¿Qué? Verifica la dirección de email usando el token recibido en el correo de registro.
- * ¿Para qué? Enviar POST /api/v1/auth/verify-email con el token UUID del enlace de verificación.
+ * ¿Para qué? Enviar POST /api/v1/auth/verify-email con el token del enlace de verificación.
  * ¿Impacto? Activa is_email_verified=True en la BD — sin esto el usuario no puede iniciar sesión.
  */
 export async function verifyEmail(token: string): Promise<MessageResponse> {
@@ -1,7 +1,7 @@
 /**
  * Archivo: VerifyEmailPage.tsx
  * Descripción: Página de verificación de email — procesa el token del enlace enviado al registrarse.
- * ¿Para qué? Capturar el token UUID de la URL (?token=...), llamar al backend y mostrar el resultado.
+ * ¿Para qué? Capturar el token de la URL (?token=...), llamar al backend y mostrar el resultado.
  * ¿Impacto? Sin esta página, el enlace del email de verificación lleva a un 404 y el usuario
  *           nunca puede activar su cuenta ni iniciar sesión.
  */
@@ -22,7 +22,7 @@ type VerifyStatus = "loading" | "success" | "error";
  */
 export function VerifyEmailPage() {
   // ¿Qué? Hook para leer los query params de la URL (ej: ?token=uuid).
-  // ¿Para qué? Extraer el token UUID que viene en el enlace del email de verificación.
+  // ¿Para qué? Extraer el token que viene en el enlace del email de verificación.
   // ¿Impacto? Si no hay token en la URL, mostramos error inmediatamente.
   const [searchParams] = useSearchParams();
 